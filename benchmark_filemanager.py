@@ -0,0 +1,767 @@
+""" Benchmarks the FileManager operations over a matrix of data sizes.
+
+Every benchmark runs on a local temporary directory and reports the p50/p99 latency,
+the throughput and the peak Python memory of one operation. Results can be saved as
+JSON and compared against a previously saved baseline; ``--metrics`` runs the whole
+suite with ``enable_metrics()`` to measure the instrumentation overhead.
+
+    python benchmark_filemanager.py --output baseline.json
+    python benchmark_filemanager.py --baseline baseline.json --tolerance 0.25
+    python benchmark_filemanager.py --baseline baseline.json --metrics
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+from filemanager import CHUNK_SIZE, FileManager
+
+FILE_SIZES = (1024, 1024 ** 2, 16 * 1024 ** 2)
+LINE_COUNTS = (100, 10000, 100000)
+FAN_OUTS = (10, 100, 1000)
+DEPTHS = (1, 3, 5)
+QUICK_MATRIX = {'file_size': (1024, 64 * 1024), 'line_count': (100, 1000), 'fan_out': (10, 100), 'depth': (1, 3)}
+FULL_MATRIX = {'file_size': FILE_SIZES, 'line_count': LINE_COUNTS, 'fan_out': FAN_OUTS, 'depth': DEPTHS}
+TREE_BRANCHING = 3
+TREE_FILES = 2
+
+# run: the measured callable; size: bytes (or items) processed per call;
+# reset: optional untimed callable restoring the fixture before each call;
+# teardown: optional callable releasing the fixture's resources
+Case = namedtuple('Case', 'run size reset teardown')
+Case.__new__.__defaults__ = (None, None)
+Result = namedtuple('Result', 'name group param repeat p50 p99 mean throughput peak_memory')
+
+BENCHMARKS = []
+
+
+def benchmark(group):
+    """ Registers a benchmark run for every value of the ``group`` matrix dimension. """
+    def decorator(func):
+        BENCHMARKS.append((func.__name__, group, func))
+        return func
+    return decorator
+
+
+def _write(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb' if isinstance(content, bytes) else 'w') as f:
+        f.write(content)
+    return path
+
+
+def _text(size):
+    line = 'lorem ipsum dolor sit amet, consectetur adipiscing elit\n'
+    return (line * (size // len(line) + 1))[:size]
+
+
+def _lines(count):
+    return ''.join(f'line {i:08d} lorem ipsum dolor sit amet\n' for i in range(count))
+
+
+def _flat(root, count):
+    directory = os.path.join(root, 'flat')
+    return [_write(os.path.join(directory, f'file{i:06d}.txt'), f'content {i}\n') for i in range(count)]
+
+
+def _count_lines(lines):
+    return sum(1 for _ in lines)
+
+
+def _toggle(forward, backward):
+    state = {'forward': True}
+
+    def run():
+        (forward if state['forward'] else backward)()
+        state['forward'] = not state['forward']
+    return run
+
+
+def _tree(root, depth):
+    base = os.path.join(root, 'tree')
+    directories = [base]
+    for _ in range(depth):
+        directories = [os.path.join(d, f'dir{i}') for d in directories for i in range(TREE_BRANCHING)]
+        for directory in directories:
+            for i in range(TREE_FILES):
+                _write(os.path.join(directory, f'file{i}.txt'), _lines(10))
+    return base
+
+
+# File content
+
+@benchmark('file_size')
+def read_content(fm, root, size):
+    path = _write(os.path.join(root, 'file.txt'), _text(size))
+    return Case(lambda: fm.read_content(path), size)
+
+
+@benchmark('file_size')
+def read_bytes(fm, root, size):
+    path = _write(os.path.join(root, 'file.bin'), os.urandom(size))
+    return Case(lambda: fm.read_bytes(path), size)
+
+
+@benchmark('file_size')
+def read_into(fm, root, size):
+    path = _write(os.path.join(root, 'file.bin'), os.urandom(size))
+    buffer = bytearray(size)
+    return Case(lambda: fm.read_into(buffer, path), size)
+
+
+@benchmark('file_size')
+def map_content(fm, root, size):
+    path = _write(os.path.join(root, 'file.bin'), os.urandom(size))
+
+    def run():
+        with fm.map_content(path) as m:
+            m[-1:]
+    return Case(run, size)
+
+
+@benchmark('file_size')
+def iter_chunks(fm, root, size):
+    path = _write(os.path.join(root, 'file.txt'), _text(size))
+    return Case(lambda: sum(map(len, fm.iter_chunks(CHUNK_SIZE, path))), size)
+
+
+@benchmark('file_size')
+def write_content(fm, root, size):
+    path, content = os.path.join(root, 'file.txt'), _text(size)
+    return Case(lambda: fm.write_content(content, path), size)
+
+
+@benchmark('file_size')
+def write_content_atomic(fm, root, size):
+    path, content = os.path.join(root, 'file.txt'), _text(size)
+    return Case(lambda: fm.write_content(content, path, atomic=True), size)
+
+
+@benchmark('file_size')
+def write_bytes(fm, root, size):
+    path, content = os.path.join(root, 'file.bin'), os.urandom(size)
+    return Case(lambda: fm.write_bytes(content, path), size)
+
+
+@benchmark('file_size')
+def read_content_metrics(fm, root, size):
+    path = _write(os.path.join(root, 'file.txt'), _text(size))
+    fm.enable_metrics()
+    return Case(lambda: fm.read_content(path), size)
+
+
+@benchmark('file_size')
+def write_content_metrics(fm, root, size):
+    path, content = os.path.join(root, 'file.txt'), _text(size)
+    fm.enable_metrics()
+    return Case(lambda: fm.write_content(content, path), size)
+
+
+@benchmark('file_size')
+def append_bytes(fm, root, size):
+    path, content = os.path.join(root, 'file.bin'), os.urandom(size)
+    return Case(lambda: fm.append_bytes(content, path), size, lambda: _write(path, b''))
+
+
+@benchmark('file_size')
+def append_content(fm, root, size):
+    path, content = os.path.join(root, 'file.txt'), _text(size)
+    return Case(lambda: fm.append_content(content, path), size, lambda: fm.clear_file_content(path))
+
+
+@benchmark('file_size')
+def write_content_compressed(fm, root, size):
+    path, content = os.path.join(root, 'file.txt.gz'), _text(size)
+    fm.enable_compression(level=1)
+    return Case(lambda: fm.write_content(content, path), size)
+
+
+@benchmark('file_size')
+def copy_file(fm, root, size):
+    path = _write(os.path.join(root, 'file.bin'), os.urandom(size))
+    new_path = os.path.join(root, 'copy.bin')
+    return Case(lambda: fm.copy_file(new_path, path), size, lambda: os.path.exists(new_path) and os.remove(new_path))
+
+
+@benchmark('file_size')
+def write_content_write_behind(fm, root, size):
+    path, content = os.path.join(root, 'file.txt'), _text(size)
+    fm.enable_write_behind(flush_interval=None, max_pending_size=None)
+    return Case(lambda: fm.write_content(content, path), size)
+
+
+@benchmark('file_size')
+def write_behind_flush(fm, root, size):
+    path, content = os.path.join(root, 'file.txt'), _text(size)
+    fm.enable_write_behind(flush_interval=None, max_pending_size=None)
+    return Case(fm.flush, size, lambda: fm.write_content(content, path))
+
+
+@benchmark('file_size')
+def clear_file_content(fm, root, size):
+    path, content = os.path.join(root, 'file.txt'), _text(size)
+    return Case(lambda: fm.clear_file_content(path), size, lambda: _write(path, content))
+
+
+@benchmark('file_size')
+def move(fm, root, size):
+    path = _write(os.path.join(root, 'file.bin'), os.urandom(size))
+    new_path = os.path.join(root, 'moved.bin')
+    return Case(_toggle(lambda: fm.move(new_path, path), lambda: fm.move(path, new_path)), size)
+
+
+@benchmark('file_size')
+def hash_file(fm, root, size):
+    path = _write(os.path.join(root, 'file.bin'), os.urandom(size))
+    return Case(lambda: fm.hash_file('sha256', path), size)
+
+
+# Lines
+
+@benchmark('line_count')
+def read_all_lines(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    return Case(lambda: fm.read_all_lines(path), os.path.getsize(path))
+
+
+@benchmark('line_count')
+def iter_lines(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    return Case(lambda: sum(1 for _ in fm.iter_lines(path)), os.path.getsize(path))
+
+
+@benchmark('line_count')
+def write_lines(fm, root, count):
+    path, lines = os.path.join(root, 'file.txt'), _lines(count).splitlines(True)
+    return Case(lambda: fm.write_lines(lines, path), sum(map(len, lines)))
+
+
+@benchmark('line_count')
+def build_line_index(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    return Case(lambda: fm.build_line_index(path), os.path.getsize(path), lambda: fm._line_indexes.clear())
+
+
+@benchmark('line_count')
+def read_line_first(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    return Case(lambda: fm.read_line(path), 1)
+
+
+@benchmark('line_count')
+def read_line(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    fm.build_line_index(path)
+    return Case(lambda: fm.read_line(path, count // 2), 1)
+
+
+@benchmark('line_count')
+def read_line_range(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    fm.build_line_index(path)
+    return Case(lambda: fm.read_line_range(count // 4, count // 4 + 100, path), 1)
+
+
+@benchmark('line_count')
+def read_new_lines(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    return Case(lambda: fm.read_new_lines(path), os.path.getsize(path), lambda: fm._tail_offsets.clear())
+
+
+@benchmark('line_count')
+def follow_lines(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    return Case(lambda: sum(1 for _ in fm.follow_lines(interval=1e-4, timeout=0, path=path)), count,
+                fm._tail_offsets.clear)
+
+
+@benchmark('line_count')
+def search_content(fm, root, count):
+    path = _write(os.path.join(root, 'search', 'file.txt'), _lines(count))
+    return Case(lambda: list(fm.search_content('line 0000', literal=True, path=os.path.dirname(path))),
+                os.path.getsize(path))
+
+
+@benchmark('line_count')
+def process_lines(fm, root, count):
+    path = _write(os.path.join(root, 'file.txt'), _lines(count))
+    size = os.path.getsize(path)
+    return Case(lambda: fm.process_lines(_count_lines, merge=sum, workers=2, chunk_size=max(1, size // 4), path=path),
+                size)
+
+
+@benchmark('line_count')
+def append_content_per_line(fm, root, count):
+    path, lines = os.path.join(root, 'file.txt'), _lines(count).splitlines(True)
+
+    def run():
+        for line in lines:
+            fm.append_content(line, path)
+    return Case(run, count, lambda: _write(path, ''))
+
+
+@benchmark('line_count')
+def file_appender(fm, root, count):
+    paths = [os.path.join(root, f'file{i}.txt') for i in range(4)]
+    lines = _lines(count).splitlines(True)
+    appender = fm.open_appender()
+
+    def run():
+        for i, line in enumerate(lines):
+            appender.append(line, paths[i % len(paths)])
+        appender.flush()
+
+    def reset():
+        for path in paths:
+            _write(path, '')
+    return Case(run, count, reset, appender.close)
+
+
+# Directory fan-out
+
+@benchmark('fan_out')
+def list_directory_contents(fm, root, count):
+    directory = os.path.dirname(_flat(root, count)[0])
+    return Case(lambda: fm.list_directory_contents(directory), count)
+
+
+@benchmark('fan_out')
+def path_checks(fm, root, count):
+    paths = _flat(root, count)
+    return Case(lambda: [fm.is_file(path) for path in paths], count)
+
+
+@benchmark('fan_out')
+def path_checks_stat_cache(fm, root, count):
+    paths = _flat(root, count)
+    fm.enable_stat_cache(ttl=60.0, max_size=count)
+    return Case(lambda: [fm.is_file(path) for path in paths], count)
+
+
+@benchmark('fan_out')
+def path_checks_metrics(fm, root, count):
+    paths = _flat(root, count)
+    fm.enable_metrics()
+    return Case(lambda: [fm.is_file(path) for path in paths], count)
+
+
+@benchmark('fan_out')
+def path_checks_metrics_hook(fm, root, count):
+    paths = _flat(root, count)
+    fm.enable_metrics()
+    fm.add_metrics_hook(lambda *args: None)
+    return Case(lambda: [fm.is_file(path) for path in paths], count)
+
+
+@benchmark('fan_out')
+def export_metrics(fm, root, count):
+    fm.enable_metrics()
+    for path in _flat(root, count):
+        fm.read_content(path)
+    metrics_path = os.path.join(root, 'metrics.json')
+    return Case(lambda: (fm.get_metrics(), fm.export_metrics(metrics_path)), count)
+
+
+@benchmark('fan_out')
+def path_validation(fm, root, count):
+    paths = _flat(root, count)
+
+    def run():
+        for path in paths:
+            fm.is_directory(path)
+            fm.is_valid_path(path)
+            fm.path_exists(path)
+    return Case(run, count)
+
+
+@benchmark('fan_out')
+def change_directory(fm, root, count):
+    cwd = os.getcwd()
+    directories = [os.path.join(root, f'dir{i:06d}') for i in range(count)]
+    for directory in directories:
+        os.mkdir(directory)
+
+    def run():
+        for directory in directories:
+            fm.change_directory(directory)
+            fm.get_current_directory()
+    return Case(run, count, teardown=lambda: os.chdir(cwd))
+
+
+@benchmark('fan_out')
+def create_files(fm, root, count):
+    directory = os.path.join(root, 'flat')
+    paths = [os.path.join(directory, f'file{i:06d}.txt') for i in range(count)]
+
+    def reset():
+        shutil.rmtree(directory, ignore_errors=True)
+        os.mkdir(directory)
+    return Case(lambda: fm.create_files(paths), count, reset)
+
+
+@benchmark('fan_out')
+def rename_files(fm, root, count):
+    paths = _flat(root, count)
+    pairs = [(path + '.renamed', path) for path in paths]
+    back = [(path, new_path) for new_path, path in pairs]
+    state = {'renamed': False}
+
+    def run():
+        fm.rename_files(back if state['renamed'] else pairs)
+        state['renamed'] = not state['renamed']
+    return Case(run, count)
+
+
+@benchmark('fan_out')
+def delete_files(fm, root, count):
+    directory = os.path.join(root, 'flat')
+    return Case(lambda: fm.delete_files([os.path.join(directory, name) for name in os.listdir(directory)]),
+                count, lambda: (shutil.rmtree(directory, ignore_errors=True), _flat(root, count)))
+
+
+@benchmark('fan_out')
+def create_file(fm, root, count):
+    directory = os.path.join(root, 'flat')
+    paths = [os.path.join(directory, f'file{i:06d}.txt') for i in range(count)]
+
+    def reset():
+        shutil.rmtree(directory, ignore_errors=True)
+        os.mkdir(directory)
+    return Case(lambda: [fm.create_file(path) for path in paths], count, reset)
+
+
+@benchmark('fan_out')
+def rename_file(fm, root, count):
+    paths = _flat(root, count)
+    return Case(_toggle(lambda: [fm.rename_file(path + '.renamed', path) for path in paths],
+                        lambda: [fm.rename_file(path, path + '.renamed') for path in paths]), count)
+
+
+@benchmark('fan_out')
+def delete_file(fm, root, count):
+    directory = os.path.join(root, 'flat')
+    return Case(lambda: [fm.delete_file(os.path.join(directory, name)) for name in os.listdir(directory)],
+                count, lambda: (shutil.rmtree(directory, ignore_errors=True), _flat(root, count)))
+
+
+@benchmark('fan_out')
+def create_directory(fm, root, count):
+    directory = os.path.join(root, 'dirs')
+    paths = [os.path.join(directory, f'dir{i:06d}') for i in range(count)]
+
+    def reset():
+        shutil.rmtree(directory, ignore_errors=True)
+        os.mkdir(directory)
+    return Case(lambda: [fm.create_directory(path) for path in paths], count, reset)
+
+
+@benchmark('fan_out')
+def rename_directory(fm, root, count):
+    paths = [os.path.join(root, f'dir{i:06d}') for i in range(count)]
+    for path in paths:
+        os.mkdir(path)
+    return Case(_toggle(lambda: [fm.rename_directory(path + '.renamed', path) for path in paths],
+                        lambda: [fm.rename_directory(path, path + '.renamed') for path in paths]), count)
+
+
+@benchmark('fan_out')
+def durable_writes(fm, root, count):
+    paths = [os.path.join(root, f'file{i:06d}.txt') for i in range(count)]
+    return Case(lambda: [fm.write_content('test', path, durable=True) for path in paths], count)
+
+
+@benchmark('fan_out')
+def group_commit(fm, root, count):
+    paths = [os.path.join(root, f'file{i:06d}.txt') for i in range(count)]
+
+    def run():
+        with fm.group_commit():
+            for path in paths:
+                fm.write_content('test', path, durable=True)
+    return Case(run, count)
+
+
+@benchmark('fan_out')
+def path_methods(fm, root, count):
+    paths = [os.path.join(root, f'dir{i % 10}', f'file{i:06d}.txt') for i in range(count)]
+
+    def run():
+        for path in paths:
+            fm.get_parent_directory(path)
+            fm.get_base_name(path)
+            fm.get_file_extension(path)
+            fm.path_join(root, path)
+    return Case(run, count)
+
+
+@benchmark('fan_out')
+def path_batch_methods(fm, root, count):
+    paths = [os.path.join(root, f'dir{i % 10}', f'file{i:06d}.txt') for i in range(count)]
+
+    def run():
+        fm.get_parent_directories(paths)
+        fm.get_base_names(paths)
+        fm.get_file_extensions(paths)
+        fm.path_join_many(root, paths)
+    return Case(run, count)
+
+
+@benchmark('fan_out')
+def split_and_group_paths(fm, root, count):
+    paths = [os.path.join(root, f'dir{i % 10}', f'file{i:06d}.{("txt", "csv")[i % 2]}') for i in range(count)]
+    return Case(lambda: (fm.split_paths(paths), fm.group_paths(paths), fm.group_paths(paths, key='parent')), count)
+
+
+@benchmark('fan_out')
+def scan_directory_flat(fm, root, count):
+    directory = os.path.dirname(_flat(root, count)[0])
+    return Case(lambda: sum(1 for _ in fm.scan_directory(path=directory)), count)
+
+
+@benchmark('fan_out')
+def find_duplicates(fm, root, count):
+    directory = os.path.dirname(_flat(root, count)[0])
+    return Case(lambda: fm.find_duplicates(path=directory), count, lambda: fm._hash_cache.clear())
+
+
+@benchmark('fan_out')
+def hash_files(fm, root, count):
+    paths = _flat(root, count)
+    return Case(lambda: fm.hash_files(paths), count, fm._hash_cache.clear)
+
+
+@benchmark('fan_out')
+def save_hash_cache(fm, root, count):
+    fm.hash_files(_flat(root, count))
+    cache_path = os.path.join(root, 'hashes.json')
+    return Case(lambda: fm.save_hash_cache(cache_path), count)
+
+
+@benchmark('fan_out')
+def load_hash_cache(fm, root, count):
+    fm.hash_files(_flat(root, count))
+    cache_path = os.path.join(root, 'hashes.json')
+    fm.save_hash_cache(cache_path)
+    return Case(lambda: fm.load_hash_cache(cache_path), count, fm._hash_cache.clear)
+
+
+@benchmark('fan_out')
+def index_refresh(fm, root, count):
+    paths = _flat(root, count)
+    index = fm.enable_index(path=os.path.dirname(paths[0]))
+    return Case(index.refresh, count, lambda: os.utime(os.path.dirname(paths[0])))
+
+
+@benchmark('fan_out')
+def index_query(fm, root, count):
+    paths = _flat(root, count)
+    index = fm.enable_index(path=os.path.dirname(paths[0]))
+    return Case(lambda: (index.query(extension='.txt'), index.query(pattern='file00000*', min_size=1)), count)
+
+
+# Directory depth
+
+def _tree_size(depth):
+    return sum(TREE_BRANCHING ** level * (TREE_FILES + 1) for level in range(1, depth + 1))
+
+
+@benchmark('depth')
+def walk_directory(fm, root, depth):
+    base = _tree(root, depth)
+    return Case(lambda: sum(1 for _ in fm.walk_directory(path=base)), _tree_size(depth))
+
+
+@benchmark('depth')
+def scan_directory(fm, root, depth):
+    base = _tree(root, depth)
+    return Case(lambda: sum(1 for _ in fm.scan_directory(path=base)), _tree_size(depth))
+
+
+@benchmark('depth')
+def take_snapshot(fm, root, depth):
+    base = _tree(root, depth)
+    return Case(lambda: fm.take_snapshot(path=base), _tree_size(depth))
+
+
+@benchmark('depth')
+def save_snapshot(fm, root, depth):
+    snapshot = fm.take_snapshot(path=_tree(root, depth))
+    snapshot_path = os.path.join(root, 'tree.snapshot')
+    return Case(lambda: fm.save_snapshot(snapshot, snapshot_path), _tree_size(depth))
+
+
+@benchmark('depth')
+def load_snapshot(fm, root, depth):
+    snapshot_path = os.path.join(root, 'tree.snapshot')
+    fm.save_snapshot(fm.take_snapshot(path=_tree(root, depth)), snapshot_path)
+    return Case(lambda: fm.load_snapshot(snapshot_path), _tree_size(depth))
+
+
+@benchmark('depth')
+def diff_snapshots(fm, root, depth):
+    base = _tree(root, depth)
+    old = fm.take_snapshot(path=base)
+    for directory, _, names in os.walk(base):
+        for name in names[:1]:
+            _write(os.path.join(directory, name), 'changed')
+        _write(os.path.join(directory, 'added.txt'), 'added')
+    new = fm.take_snapshot(path=base)
+    return Case(lambda: fm.diff_snapshots(old, new), _tree_size(depth))
+
+
+@benchmark('depth')
+def take_snapshot_incremental(fm, root, depth):
+    base = _tree(root, depth)
+    previous = fm.take_snapshot(path=base)
+    return Case(lambda: fm.take_snapshot(previous, skip_unchanged=True, path=base), _tree_size(depth))
+
+
+@benchmark('depth')
+def disk_usage(fm, root, depth):
+    base = _tree(root, depth)
+    return Case(lambda: fm.disk_usage(path=base, use_cache=False), _tree_size(depth))
+
+
+@benchmark('depth')
+def disk_usage_cached(fm, root, depth):
+    base = _tree(root, depth)
+    return Case(lambda: fm.disk_usage(path=base), _tree_size(depth))
+
+
+@benchmark('depth')
+def largest_directories(fm, root, depth):
+    base = _tree(root, depth)
+    return Case(lambda: fm.largest_directories(path=base, use_cache=False), _tree_size(depth))
+
+
+@benchmark('depth')
+def copy_directory(fm, root, depth):
+    base = _tree(root, depth)
+    new_path = os.path.join(root, 'copy')
+    return Case(lambda: fm.copy_directory(new_path, path=base), _tree_size(depth),
+                lambda: shutil.rmtree(new_path, ignore_errors=True))
+
+
+@benchmark('depth')
+def delete_directory(fm, root, depth):
+    base = os.path.join(root, 'tree')
+    return Case(lambda: fm.delete_directory(base, recursive=True), _tree_size(depth),
+                lambda: (shutil.rmtree(base, ignore_errors=True), _tree(root, depth)))
+
+
+def _percentile(samples, percent):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, int(round(percent / 100 * len(ordered) + 0.5)) - 1))]
+
+
+def run_benchmark(name, group, func, param, repeat, warmup=1, metrics=False):
+    """ Runs a single benchmark and returns its ``Result``. """
+    with tempfile.TemporaryDirectory() as root:
+        fm, case = FileManager(root), None
+        if metrics:
+            fm.enable_metrics()
+        try:
+            case = func(fm, root, param)
+            samples = []
+            for i in range(warmup + repeat):
+                if case.reset is not None:
+                    case.reset()
+                start = time.perf_counter()
+                case.run()
+                if i >= warmup:
+                    samples.append(time.perf_counter() - start)
+            if case.reset is not None:
+                case.reset()
+            tracemalloc.start()
+            try:
+                case.run()
+                peak_memory = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+        finally:
+            if case is not None and case.teardown is not None:
+                case.teardown()
+            fm.disable_write_behind()
+            fm.disable_index()
+    mean = sum(samples) / len(samples)
+    return Result(f'{name}[{param}]', group, param, repeat, _percentile(samples, 50), _percentile(samples, 99),
+                  mean, case.size / mean if mean else 0.0, peak_memory)
+
+
+def run_benchmarks(matrix, repeat, pattern=None, stream=None, metrics=False):
+    """ Runs every registered benchmark over the matrix and returns the results. """
+    results = []
+    for name, group, func in BENCHMARKS:
+        for param in matrix[group]:
+            if pattern is not None and not re.search(pattern, f'{name}[{param}]'):
+                continue
+            result = run_benchmark(name, group, func, param, repeat, metrics=metrics)
+            results.append(result)
+            if stream is not None:
+                print(f'{result.name:<45} p50 {result.p50 * 1e3:>10.3f} ms  p99 {result.p99 * 1e3:>10.3f} ms  '
+                      f'{result.throughput:>14,.0f}/s  peak {result.peak_memory / 1024:>10,.1f} KiB',
+                      file=stream, flush=True)
+    return results
+
+
+def to_json(results, repeat, metrics=False):
+    return {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                 'cpu_count': os.cpu_count(), 'timestamp': time.time(), 'repeat': repeat,
+                 'metrics': metrics},
+        'results': {result.name: result._asdict() for result in results},
+    }
+
+
+def compare(current, baseline, tolerance):
+    """ Returns ``(name, baseline_p50, current_p50, ratio)`` for every benchmark slower than the baseline by more than ``tolerance``. """
+    regressions = []
+    for name, result in current['results'].items():
+        previous = baseline['results'].get(name)
+        if previous is None or not previous['p50']:
+            continue
+        ratio = result['p50'] / previous['p50']
+        if ratio > 1 + tolerance:
+            regressions.append((name, previous['p50'], result['p50'], ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks the FileManager operations.')
+    parser.add_argument('--quick', action='store_true', help='run a reduced matrix')
+    parser.add_argument('--repeat', type=int, default=20, help='timed runs per benchmark (default: 20)')
+    parser.add_argument('--filter', dest='pattern', help='only run the benchmarks matching this regex')
+    parser.add_argument('--output', help='save the results as JSON')
+    parser.add_argument('--baseline', help='compare against results saved with --output')
+    parser.add_argument('--metrics', action='store_true', help='run every benchmark with enable_metrics()')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed p50 slowdown relative to the baseline (default: 0.2)')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    results = run_benchmarks(QUICK_MATRIX if args.quick else FULL_MATRIX, args.repeat, args.pattern, sys.stdout,
+                             args.metrics)
+    current = to_json(results, args.repeat, args.metrics)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        for name, previous, p50, ratio in regressions:
+            print(f'REGRESSION {name}: p50 {previous * 1e3:.3f} ms -> {p50 * 1e3:.3f} ms ({ratio:.2f}x)')
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,95 @@
+import asyncio
+import errno
+import functools
+import hashlib
+import heapq
+import json
+import locale
+import mmap
 import os
+import queue
+import re
+import stat
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from collections import OrderedDict, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from itertools import islice, repeat
+
+try:
+    import sqlite3
+except ImportError:
+    sqlite3 = None
+
+Codec = namedtuple('Codec', 'open compressor')
+COMPRESSION_CODECS = {}
+try:
+    import gzip
+    COMPRESSION_CODECS['.gz'] = Codec(
+        lambda path, mode, level: gzip.open(path, mode, **({} if level is None else {'compresslevel': level})),
+        lambda level: zlib.compressobj(9 if level is None else level, zlib.DEFLATED, 31))
+except ImportError:
+    pass
+try:
+    import bz2
+    COMPRESSION_CODECS['.bz2'] = Codec(
+        lambda path, mode, level: bz2.open(path, mode, **({} if level is None else {'compresslevel': max(1, level)})),
+        lambda level: bz2.BZ2Compressor(9 if level is None else max(1, level)))
+except ImportError:
+    pass
+try:
+    import lzma
+    COMPRESSION_CODECS['.xz'] = Codec(
+        lambda path, mode, level: lzma.open(path, mode, preset=level),
+        lambda level: lzma.LZMACompressor(preset=level))
+except ImportError:
+    pass
+
+CHUNK_SIZE = 1024 * 1024
+BYTES_TYPES = (bytes, bytearray, memoryview)
+WORKERS = min(32, (os.cpu_count() or 1) + 4)
+ASYNC_BATCH_SIZE = 1024
+LINE_INDEX_SUFFIX = '.lineidx'
+LINE_INDEX_HEADER = struct.Struct('<4sQqQ')
+SNAPSHOT_MAGIC = b'FMSS\x01'
+SNAPSHOT_RECORD = struct.Struct('<HBQqQ')
+SNAPSHOT_TYPES = ('file', 'directory', 'symlink', 'other')
+LATENCY_BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, 5.0, float('inf'))
+MUTATING_OPS = frozenset(('write', 'append', 'writelines', 'writebytes', 'appendbytes',
+                          'mkdir', 'rename', 'remove', 'rmdir'))
+
+FileEntry = namedtuple('FileEntry', 'path name type size mtime_ns inode device')
+OperationResult = namedtuple('OperationResult', 'item result error')
+SearchMatch = namedtuple('SearchMatch', 'path line_number line')
+DeleteReport = namedtuple('DeleteReport', 'files directories errors')
+SnapshotEntry = namedtuple('SnapshotEntry', 'type size mtime_ns inode')
+SnapshotDiff = namedtuple('SnapshotDiff', 'added removed modified renamed')
+PathColumns = namedtuple('PathColumns', 'parents base_names extensions')
+DiskUsage = namedtuple('DiskUsage', 'apparent_size allocated_size files directories')
+
+
+def _iter_range_lines(f, start, stop, encoding):
+    f.seek(start)
+    while start < stop:
+        line = f.readline()
+        if not line:
+            return
+        start += len(line)
+        yield line.decode(encoding).replace('\r\n', '\n')
+
+
+def _process_line_range(func, path, start, stop, encoding, part_path):
+    with open(path, 'rb') as f:
+        lines = _iter_range_lines(f, start, stop, encoding)
+        if part_path is None:
+            return func(lines)
+        with open(part_path, 'x', encoding=encoding) as part:
+            part.writelines(func(lines))
 
 
 class FileManager:
@@ -10,6 +101,7 @@ class FileManager:
     - File Operations (e.g., create_file, delete_file)
     - File Content Management (e.g., read_content, write_content)
     - Directory Operations (e.g., create_directory, delete_directory)
+    - Performance Tuning (e.g., enable_stat_cache)
 
     Author
     ------
@@ -55,6 +147,24 @@ class FileManager:
         get_file_extension(path)
             Returns the file extension of a path (if any).
 
+        path_join_many(columns)
+            Joins multiple columns of path components into a list of paths.
+
+        get_parent_directories(paths)
+            Returns the parent directories of multiple paths.
+
+        get_base_names(paths)
+            Returns the base names of multiple paths.
+
+        get_file_extensions(paths)
+            Returns the file extensions of multiple paths.
+
+        split_paths(paths)
+            Splits multiple paths into columns of parent directories, base names and file extensions.
+
+        group_paths(paths, key)
+            Groups multiple paths by file extension or parent directory.
+
     File Operations
         create_file(path):
             Creates a new file.
@@ -65,42 +175,216 @@ class FileManager:
         delete_file(path):
             Deletes an existing file.
 
+        copy_file(new_path, path):
+            Copies an existing file.
+
+        move(new_path, path):
+            Moves an existing file or directory, across filesystems if needed.
+
+        create_files(paths, workers):
+            Creates multiple new files concurrently.
+
+        rename_files(pairs, workers):
+            Renames multiple existing files concurrently.
+
+        delete_files(paths, workers):
+            Deletes multiple existing files concurrently.
+
+        hash_file(algorithm, path):
+            Returns the checksum of the file content.
+
+        hash_files(paths, algorithm, workers):
+            Returns the checksums of multiple files concurrently.
+
+        find_duplicates(algorithm, workers, path, onerror):
+            Finds files with identical content in a directory tree.
+
+        load_hash_cache(cache_path):
+            Loads previously computed checksums from a cache file.
+
+        save_hash_cache(cache_path):
+            Saves the computed checksums to a cache file.
+
     File Content Management
         read_content(path):
             Reads the file content.
 
-        write_content(content, path):
+        write_content(content, path, atomic, durable):
             Writes the provided content to a file.
 
         append_content(content, path):
             Appends the provided content to a file.
 
-        read_line(path):
+        read_line(path, line_number):
             Reads single line of a file.
 
+        read_line_range(start, stop, path):
+            Reads a range of lines of a file.
+
+        build_line_index(path, persist):
+            Builds the line-offset index used for random-access line reads.
+
+        read_new_lines(path):
+            Reads the complete lines appended to a file since the previous call.
+
+        follow_lines(interval, timeout, from_end, path):
+            Iterates over the lines appended to a file as it grows.
+
         read_all_lines(path):
             Reads all lines of a file.
 
-        write_lines(lines, path):
+        write_lines(lines, path, atomic, durable):
             Writes the provided lines to a file.
 
         clear_file_content(path):
             Clears the file content.
+
+        iter_chunks(size, path):
+            Iterates over the file content in fixed-size chunks.
+
+        iter_lines(path):
+            Iterates over the lines of a file.
+
+        process_lines(func, merge, output_path, workers, chunk_size, path):
+            Processes the lines of a file in parallel, one byte range per process.
+
+        map_content(path):
+            Maps the file content into memory for zero-copy reads.
+
+        read_bytes(path):
+            Reads the file content as bytes.
+
+        read_into(buffer, path):
+            Reads the file content into a preallocated buffer.
+
+        write_bytes(content, path, atomic, durable):
+            Writes the provided bytes to a file.
+
+        append_bytes(content, path):
+            Appends the provided bytes to a file.
+
+        group_commit(workers):
+            Batches the directory flushes of durable writes issued within a ``with`` block.
+
+        open_appender(max_handles, buffering, flush_interval, flush_size):
+            Opens an appender that keeps frequently appended files open.
     
     Directory Operations
         list_directory_contents(path):
             Lists the contents of a directory.
 
+        walk_directory(extensions, max_depth, follow_symlinks, path, onerror):
+            Recursively iterates over the entries of a directory tree.
+
+        scan_directory(workers, ordered, extensions, max_depth, follow_symlinks, path, onerror):
+            Recursively iterates over the entries of a directory tree, listing directories concurrently.
+
+        search_content(pattern, literal, extensions, first_match_only, workers, path, onerror):
+            Searches the content of the files in a directory tree for a pattern.
+
+        take_snapshot(previous, skip_unchanged, path):
+            Records the metadata of every entry in a directory tree.
+
+        save_snapshot(snapshot, snapshot_path):
+            Saves a snapshot to a compact file.
+
+        load_snapshot(snapshot_path):
+            Loads a snapshot from a file.
+
+        diff_snapshots(old, new):
+            Compares two snapshots of a directory tree.
+
         create_directory(path):
             Creates a new directory.
 
         rename_directory(new_path, path):
             Renames an existing directory.
 
-        delete_directory(path):
+        copy_directory(new_path, workers, path):
+            Copies an existing directory and its contents.
+
+        delete_directory(path, recursive, workers):
             Deletes an existing directory.
+
+        disk_usage(workers, path, use_cache):
+            Computes the disk usage of every directory in a directory tree.
+
+        largest_directories(count, workers, path, use_cache):
+            Returns the directories with the largest disk usage in a directory tree.
+
+    Performance Tuning
+        enable_stat_cache(ttl, max_size):
+            Enables caching of path metadata for the path validation methods.
+
+        disable_stat_cache():
+            Disables and clears the path metadata cache.
+
+        stat_cache_info():
+            Returns the path metadata cache statistics.
+
+        enable_index(database_path, path):
+            Enables a queryable SQLite index of a directory tree.
+
+        disable_index():
+            Disables and closes the directory tree index.
+
+        enable_compression(level, background_threshold):
+            Enables transparent compression of files based on their extension.
+
+        disable_compression():
+            Disables transparent compression.
+
+        enable_metrics():
+            Enables per-operation metrics for the file operations.
+
+        disable_metrics():
+            Disables and clears the per-operation metrics.
+
+        get_metrics():
+            Returns a snapshot of the per-operation metrics.
+
+        export_metrics(metrics_path):
+            Saves a snapshot of the per-operation metrics as JSON.
+
+        add_metrics_hook(hook):
+            Registers a callback invoked after every measured operation.
+
+        remove_metrics_hook(hook):
+            Unregisters a callback registered with ``add_metrics_hook``.
+
+        enable_write_behind(flush_interval, max_pending_size):
+            Enables write-behind caching of the content written with ``write_content``.
+
+        flush():
+            Writes the pending write-behind content to disk.
+
+        disable_write_behind():
+            Flushes the pending content and disables write-behind caching.
     """
     def __init__(self, path=None):
+        self._lock = threading.RLock()
+        self._stat_cache = None
+        self._stat_cache_ttl = 0
+        self._stat_cache_size = 0
+        self._stat_cache_hits = 0
+        self._stat_cache_misses = 0
+        self._group_commit = threading.local()
+        self._line_indexes = {}
+        self._tail_offsets = {}
+        self._hash_cache = {}
+        self._disk_usage_cache = {}
+        self._index = None
+        self._compression = False
+        self._compression_level = None
+        self._compression_threshold = None
+        self._metrics = None
+        self._metrics_hooks = []
+        self._write_behind = None
+        self._write_behind_size = 0
+        self._write_behind_limit = None
+        self._write_behind_stop = None
+        self._write_behind_thread = None
+        self._flush_lock = threading.Lock()
         if path is None:
             self._path = self.get_current_directory()
         else:
@@ -117,6 +401,10 @@ class FileManager:
         else:
             raise ValueError('Invalid path attribute')
 
+    @property
+    def index(self):
+        return self._index
+
     # --- Path Validation Methods ---
 
     def is_file(self, path=None):
@@ -135,7 +423,8 @@ class FileManager:
         """
         path = self._path if path is None else path
         self._validate_params(path, str, 'validate file')
-        return os.path.isfile(path)
+        st = self._stat(path)
+        return st is not None and stat.S_ISREG(st.st_mode)
     
     def is_directory(self, path=None):
         """ Checks if a path points to a directory.
@@ -153,7 +442,8 @@ class FileManager:
         """
         path = self._path if path is None else path
         self._validate_params(path, str, 'validate directory')
-        return os.path.isdir(path)
+        st = self._stat(path)
+        return st is not None and stat.S_ISDIR(st.st_mode)
 
     def is_valid_path(self, path=None):
         """ Checks if path is a file, directory, parent directory, or includes file extension.
@@ -162,11 +452,13 @@ class FileManager:
         bool
             ``True`` if path is valid, otherwise ``False``.
         """
-        is_file = self.is_file(path)
-        is_dir = self.is_directory(path)
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'validate path')
+        st = self._stat(path)
+        is_file_or_dir = st is not None and (stat.S_ISREG(st.st_mode) or stat.S_ISDIR(st.st_mode))
         is_par = True if self.get_parent_directory(path) else False
         has_ext = True if self.get_file_extension(path) else False
-        return is_file or is_dir or has_ext or is_par
+        return is_file_or_dir or has_ext or is_par
 
     def path_exists(self, path=None):
         """ Checks if a path pointing to a file or directory exists.
@@ -184,7 +476,7 @@ class FileManager:
         """
         path = self._path if path is None else path
         self._validate_params(path, str, 'validate path')
-        return os.path.exists(path)
+        return self._stat(path) is not None
 
     # --- Path Manipulation Methods ---
 
@@ -283,6 +575,138 @@ class FileManager:
         self._validate_params(path, str, 'get file extension')
         return os.path.splitext(path)[1]
 
+    def path_join_many(self, *columns):
+        """ Joins multiple columns of path components into a list of paths.
+
+        Parameters
+        ----------
+        *columns: positional arguments
+            Any number of path component columns, each a string (shared by every path)
+            or a sequence of strings (one per path). Sequences must have the same length.
+                ex: ``'C:\\Users\\johndoe\\Documents'``, ``['file1.txt', 'file2.txt']``
+
+        Returns
+        -------
+        list
+            The joined paths, in input order.
+        """
+        op = 'join paths'
+        columns = [column if isinstance(column, str) else self._validate_batch(column, op) for column in columns]
+        lengths = {len(column) for column in columns if not isinstance(column, str)}
+        if len(lengths) != 1 or any(not column for column in columns if isinstance(column, str)):
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        size = lengths.pop()
+        return list(map(os.path.join, *(repeat(column, size) if isinstance(column, str) else column
+                                         for column in columns)))
+
+    def get_parent_directories(self, paths):
+        """ Returns the parent directories of multiple paths.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files/directories.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\file2.txt']``
+
+        Returns
+        -------
+        list
+            The parent directory paths (if any), in input order.
+        """
+        return list(map(os.path.dirname, self._validate_batch(paths, 'get parent directories')))
+
+    def get_base_names(self, paths):
+        """ Returns the base names of multiple paths.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files/directories.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\file2.txt']``
+
+        Returns
+        -------
+        list
+            The base names (if any), in input order.
+        """
+        return list(map(os.path.basename, self._validate_batch(paths, 'get base names')))
+
+    def get_file_extensions(self, paths):
+        """ Returns the file extensions of multiple paths.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\file2.csv']``
+
+        Returns
+        -------
+        list
+            The file extensions (if any), in input order.
+        """
+        splitext = os.path.splitext
+        return [splitext(path)[1] for path in self._validate_batch(paths, 'get file extensions')]
+
+    def split_paths(self, paths):
+        """ Splits multiple paths into columns of parent directories, base names and file extensions.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files/directories.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\file2.csv']``
+
+        Returns
+        -------
+        PathColumns
+            A ``PathColumns(parents, base_names, extensions)`` of parallel lists, in input order.
+        """
+        split, splitext = os.path.split, os.path.splitext
+        parents, base_names, extensions = [], [], []
+        for path in self._validate_batch(paths, 'split paths'):
+            parent, base_name = split(path)
+            parents.append(parent)
+            base_names.append(base_name)
+            extensions.append(splitext(base_name)[1])
+        return PathColumns(parents, base_names, extensions)
+
+    def group_paths(self, paths, key='extension'):
+        """ Groups multiple paths by file extension or parent directory.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files/directories.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\file2.csv']``
+
+        key: ``'extension'`` (default) or ``'parent'``
+            Optional parameter, groups by file extension or by parent directory.
+                ex: ``'parent'``
+
+        Returns
+        -------
+        dict
+            The paths per file extension (or parent directory), in first-seen order.
+        """
+        op = 'group paths'
+        if key == 'extension':
+            splitext = os.path.splitext
+            func = lambda path: splitext(path)[1]
+        elif key == 'parent':
+            func = os.path.dirname
+        else:
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        groups = {}
+        for path in self._validate_batch(paths, op):
+            group_key = func(path)
+            group = groups.get(group_key)
+            if group is None:
+                groups[group_key] = [path]
+            else:
+                group.append(path)
+        return groups
+
     # --- File Operations Methods ---
 
     def create_file(self, path=None):
@@ -296,6 +720,7 @@ class FileManager:
         """
         path = self._path if path is None else path
         self._validate_params(path, str, 'create file')
+        self._discard_pending(path)
         self._op_handler(path, 'write')
 
     def rename_file(self, new_path, path=None):
@@ -328,6 +753,254 @@ class FileManager:
         self._validate_params(path, str, 'delete file')
         self._op_handler(path, 'remove')
 
+    def copy_file(self, new_path, path=None):
+        """ Copies an existing file.
+
+        The content is copied inside the kernel where supported (``os.copy_file_range`` or
+        ``os.sendfile``), falling back to large-buffer copies, and holes of sparse files are
+        preserved. The permission bits are copied along with the content.
+
+        Parameters
+        ----------
+        new_path: str
+            The path of the new file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file2.txt'``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file1.txt'``
+        """
+        path = self._path if path is None else path
+        self._validate_params((new_path, path), (str, str), 'copy file')
+        self._flush_pending(path)
+        self._flush_pending(new_path)
+        try:
+            with self._measure('copy', path) as size, self._error_handler():
+                copied = self._copy_file(path, new_path)
+                if size is not None:
+                    size[0] = copied
+        finally:
+            self._path_changed(new_path)
+
+    def move(self, new_path, path=None):
+        """ Moves an existing file or directory, across filesystems if needed.
+
+        Parameters
+        ----------
+        new_path: str
+            The new path of the file or directory.
+                ex: ``'D:\\Archive\\file.txt'``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file or directory.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+        """
+        path = self._path if path is None else path
+        self._validate_params((new_path, path), (str, str), 'move')
+        self._op_handler(path, 'rename', new_path)
+
+    def create_files(self, paths, workers=WORKERS):
+        """ Creates multiple new files concurrently.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\Documents\\file2.txt']``
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of files created at the same time.
+                ex: ``16``
+
+        Returns
+        -------
+        list
+            An ``OperationResult(item, result, error)`` per path, in input order, where
+            error is the raised exception (or ``None`` if the operation succeeded).
+        """
+        return self._bulk_handler(self.create_file, paths, workers, 'create files')
+
+    def rename_files(self, pairs, workers=WORKERS):
+        """ Renames multiple existing files concurrently.
+
+        Parameters
+        ----------
+        pairs: iterable of (str, str)
+            The (path, new_path) pairs of the files.
+                ex: ``[('C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\Documents\\file2.txt')]``
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of files renamed at the same time.
+                ex: ``16``
+
+        Returns
+        -------
+        list
+            An ``OperationResult(item, result, error)`` per pair, in input order, where
+            error is the raised exception (or ``None`` if the operation succeeded).
+        """
+        return self._bulk_handler(lambda pair: self.rename_file(pair[1], pair[0]), pairs, workers, 'rename files')
+
+    def delete_files(self, paths, workers=WORKERS):
+        """ Deletes multiple existing files concurrently.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\Documents\\file2.txt']``
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of files deleted at the same time.
+                ex: ``16``
+
+        Returns
+        -------
+        list
+            An ``OperationResult(item, result, error)`` per path, in input order, where
+            error is the raised exception (or ``None`` if the operation succeeded).
+        """
+        return self._bulk_handler(self.delete_file, paths, workers, 'delete files')
+
+    def hash_file(self, algorithm='sha256', path=None):
+        """ Returns the checksum of the file content.
+
+        The file is read in fixed-size chunks, and the checksum is cached by the file's
+        device, inode, size and modification time, so unchanged files are not read again.
+
+        Parameters
+        ----------
+        algorithm: ``'sha256'`` (default) or str
+            Optional parameter, the name of a ``hashlib`` algorithm.
+                ex: ``'md5'`` or ``'blake2b'``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        Returns
+        -------
+        str
+            The hexadecimal checksum.
+        """
+        path = self._path if path is None else path
+        self._validate_params((algorithm, path), (str, str), 'hash file')
+        self._validate_algorithm(algorithm, 'hash file')
+        self._flush_pending(path)
+        with self._error_handler():
+            return self._hash_file(path, algorithm)
+
+    def hash_files(self, paths, algorithm='sha256', workers=WORKERS):
+        """ Returns the checksums of multiple files concurrently.
+
+        Parameters
+        ----------
+        paths: iterable of str
+            The paths of the files.
+                ex: ``['C:\\Users\\johndoe\\Documents\\file1.txt', 'C:\\Users\\johndoe\\Documents\\file2.txt']``
+
+        algorithm: ``'sha256'`` (default) or str
+            Optional parameter, the name of a ``hashlib`` algorithm.
+                ex: ``'md5'`` or ``'blake2b'``
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of files hashed at the same time.
+                ex: ``16``
+
+        Returns
+        -------
+        list
+            An ``OperationResult(item, result, error)`` per path, in input order, where
+            result is the hexadecimal checksum.
+        """
+        self._validate_algorithm(algorithm, 'hash files')
+        return self._bulk_handler(functools.partial(self.hash_file, algorithm), paths, workers, 'hash files')
+
+    def find_duplicates(self, algorithm='sha256', workers=WORKERS, path=None, onerror=None):
+        """ Finds files with identical content in a directory tree.
+
+        Files are first grouped by size, and only files sharing a size are hashed. Files and
+        subdirectories that cannot be read are skipped.
+
+        Parameters
+        ----------
+        algorithm: ``'sha256'`` (default) or str
+            Optional parameter, the name of a ``hashlib`` algorithm.
+                ex: ``'md5'`` or ``'blake2b'``
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of files hashed at the same time.
+                ex: ``16``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        onerror: ``None`` (default) or callable
+            Optional parameter, called with the ``OSError`` of each file or subdirectory that
+            cannot be read; it may raise to stop the search.
+
+        Returns
+        -------
+        list
+            The groups of duplicate file paths (each sorted), sorted by their first path.
+        """
+        path = self._path if path is None else path
+        self._validate_params((algorithm, workers, path), (str, int, str), 'find duplicates')
+        self._validate_algorithm(algorithm, 'find duplicates')
+        self._validate_walk_params(None, None, 'find duplicates', onerror)
+        self._flush_pending(path, tree=True)
+        with self._error_handler():
+            by_size = {}
+            for entry in self._walk_handler(path, None, None, False, onerror):
+                if entry.type == 'file':
+                    by_size.setdefault(entry.size, []).append(entry.path)
+            candidates = [p for paths in by_size.values() if len(paths) > 1 for p in paths]
+            hash_path = lambda p: (p, self._hash_file(p, algorithm))
+            by_digest = {}
+            for p, digest in self._imap_skipping_errors(hash_path, candidates, workers, onerror):
+                by_digest.setdefault(digest, []).append(p)
+        groups = [sorted(paths) for paths in by_digest.values() if len(paths) > 1]
+        return sorted(groups)
+
+    def load_hash_cache(self, cache_path):
+        """ Loads previously computed checksums from a cache file.
+
+        Parameters
+        ----------
+        cache_path: str
+            The path of the cache file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\hashes.json'``
+
+        Returns
+        -------
+        int
+            The number of loaded checksums.
+        """
+        self._validate_params(cache_path, str, 'load hash cache')
+        try:
+            entries = json.loads(self._op_handler(cache_path))
+            cache = {tuple(key): digest for key, digest in entries}
+        except (TypeError, json.JSONDecodeError):
+            raise ValueError('Unable to load hash cache: invalid cache file') from None
+        with self._lock:
+            self._hash_cache.update(cache)
+        return len(cache)
+
+    def save_hash_cache(self, cache_path):
+        """ Saves the computed checksums to a cache file.
+
+        Parameters
+        ----------
+        cache_path: str
+            The path of the cache file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\hashes.json'``
+        """
+        self._validate_params(cache_path, str, 'save hash cache')
+        with self._lock:
+            entries = [[list(key), digest] for key, digest in self._hash_cache.items()]
+        self._write_handler(cache_path, 'write', json.dumps(entries), atomic=True)
+
     # --- File Content Management Methods ---
 
     def read_content(self, path=None):
@@ -348,7 +1021,7 @@ class FileManager:
         self._validate_params(path, str, 'read content')
         return self._op_handler(path)
 
-    def write_content(self, content, path=None):
+    def write_content(self, content, path=None, atomic=False, durable=False):
         """ Writes the provided content to a file.
 
         Parameters
@@ -359,10 +1032,21 @@ class FileManager:
         path: ``None`` (default) or str
             Optional parameter, the path of the file.
                 ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        atomic: ``False`` (default) or bool
+            Optional parameter, whether the file is written to a temporary file and renamed into
+            place, so readers never observe a partially written file.
+
+        durable: ``False`` (default) or bool
+            Optional parameter, whether the data is flushed to disk (``fsync``) before returning.
         """
         path = self._path if path is None else path
         self._validate_params((content, path), (str, str), 'write content')
-        self._op_handler(path, 'write', content)
+        if self._write_behind is not None:
+            if not durable and self._defer_write(path, content, atomic):
+                return
+            self._flush_pending(path)
+        self._write_handler(path, 'write', content, atomic, durable)
 
     def append_content(self, content, path=None):
         """ Appends the provided content to a file.
@@ -380,29 +1064,50 @@ class FileManager:
         self._validate_params((content, path), (str, str), 'append content')
         self._op_handler(path, 'append', content)
 
-    def read_line(self, path=None):
+    def read_line(self, path=None, line_number=0):
         """ Reads single line of a file.
 
+        Lines other than the first are located with a line-offset index (see
+        ``build_line_index``), so only the requested line is read from the file.
+
         Parameters
         ----------
         path: ``None`` (default) or str
             Optional parameter, the path of the file.
                 ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
 
+        line_number: ``0`` (default) or int
+            Optional parameter, the zero-based number of the line.
+                ex: ``1000000``
+
         Returns
         -------
         str
-            The line of the file.
+            The line of the file (an empty string if the file has fewer lines).
         """
         path = self._path if path is None else path
         self._validate_params(path, str, 'read line')
-        return self._op_handler(path, 'readline')
+        if not (isinstance(line_number, int) and line_number >= 0):
+            raise ValueError('Unable to read line: invalid parameter')
+        if not line_number:
+            return self._op_handler(path, 'readline')
+        self._flush_pending(path)
+        lines = self._indexed_lines(path, line_number, line_number + 1)
+        return lines[0] if lines else ''
 
-    def read_all_lines(self, path=None):
-        """ Reads all lines of a file.
+    def read_line_range(self, start, stop, path=None):
+        """ Reads a range of lines of a file.
 
         Parameters
         ----------
+        start: int
+            The zero-based number of the first line.
+                ex: ``1000``
+
+        stop: int
+            The zero-based number of the line after the last line (as in slicing).
+                ex: ``2000``
+
         path: ``None`` (default) or str
             Optional parameter, the path of the file.
                 ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
@@ -410,41 +1115,463 @@ class FileManager:
         Returns
         -------
         list
-            The lines of the file.
+            The lines of the file (fewer than requested if the file ends first).
         """
         path = self._path if path is None else path
-        self._validate_params(path, str, 'read lines')
-        return self._op_handler(path, 'readlines')
+        self._validate_params(path, str, 'read line range')
+        if not all(isinstance(n, int) and n >= 0 for n in (start, stop)):
+            raise ValueError('Unable to read line range: invalid parameter')
+        self._flush_pending(path)
+        return self._indexed_lines(path, start, stop)
 
-    def write_lines(self, lines, path=None):
-        """ Writes the provided lines to a file.
+    def build_line_index(self, path=None, persist=False):
+        """ Builds the line-offset index used for random-access line reads.
+
+        The index is built in one streaming pass and kept in memory until the file
+        size or modification time changes. When persisted, it is saved next to the file
+        (with a ``.lineidx`` suffix) and reused by later instances while still valid.
 
         Parameters
         ----------
-        lines: list
-            The lines to write.
-            
         path: ``None`` (default) or str
             Optional parameter, the path of the file.
                 ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        persist: ``False`` (default) or bool
+            Optional parameter, whether the index is saved to a sidecar file.
+
+        Returns
+        -------
+        int
+            The number of lines in the file.
         """
         path = self._path if path is None else path
-        self._validate_params((lines, path), (list, str), 'write lines')
-        self._op_handler(path, 'writelines', lines)
-
-    def clear_file_content(self, path=None):
-        """ Clears the file content.
+        self._validate_params(path, str, 'build line index')
+        self._validate_uncompressed(path, 'build line index')
+        self._flush_pending(path)
+        with self._error_handler():
+            return len(self._line_index(path, persist))
+
+    def read_new_lines(self, path=None):
+        """ Reads the complete lines appended to a file since the previous call.
+
+        The byte offset reached is remembered per path, so only new content is read, in
+        chunks of ``CHUNK_SIZE`` bytes. The first call returns all complete lines, and reading
+        restarts from the beginning when the file is truncated or replaced (e.g., by log
+        rotation). A trailing line without a newline is returned once it is complete. The
+        offset only advances past content that was decoded, so undecodable content raises
+        ``ValueError`` (after the lines preceding it are returned) instead of being skipped.
 
         Parameters
         ----------
         path: ``None`` (default) or str
             Optional parameter, the path of the file.
-                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.log'``
+
+        Returns
+        -------
+        list
+            The new lines of the file.
         """
         path = self._path if path is None else path
-        self._validate_params(path, str, 'clear content')
+        self._validate_params(path, str, 'read new lines')
+        self._validate_uncompressed(path, 'read new lines')
+        self._flush_pending(path)
+        with self._error_handler():
+            lines = []
+            try:
+                lines.extend(self._tail_lines(path))
+            except UnicodeDecodeError:
+                # the offset stops before the undecodable chunk, so return the lines before it
+                if not lines:
+                    raise
+            return lines
+
+    def follow_lines(self, interval=1.0, timeout=None, from_end=False, path=None):
+        """ Iterates over the lines appended to a file as it grows.
+
+        The file is polled every ``interval`` seconds with ``read_new_lines``, so each poll
+        only reads the new content. Truncated and rotated files are followed from the start.
+
+        Parameters
+        ----------
+        interval: ``1.0`` (default) or float
+            Optional parameter, the number of seconds between polls.
+                ex: ``0.1``
+
+        timeout: ``None`` (default) or float
+            Optional parameter, the number of seconds without new lines after which iteration
+            stops (``None`` waits indefinitely).
+                ex: ``30.0``
+
+        from_end: ``False`` (default) or bool
+            Optional parameter, whether the existing content is skipped.
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.log'``
+
+        Returns
+        -------
+        generator
+            The new lines of the file, one line at a time.
+        """
+        path = self._path if path is None else path
+        self._validate_params((interval, path), ((int, float), str), 'follow lines')
+        if interval <= 0 or not (timeout is None or (isinstance(timeout, (int, float)) and timeout >= 0)):
+            raise ValueError('Unable to follow lines: invalid parameter')
+        self._validate_uncompressed(path, 'follow lines')
+        with self._error_handler():
+            st = os.stat(path)
+            if from_end:
+                self._tail_offsets[os.path.abspath(path)] = (st.st_dev, st.st_ino, st.st_size)
+        return self._follow_handler(path, interval, timeout)
+
+    def read_all_lines(self, path=None):
+        """ Reads all lines of a file.
+
+        Parameters
+        ----------
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        Returns
+        -------
+        list
+            The lines of the file.
+        """
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'read lines')
+        return self._op_handler(path, 'readlines')
+
+    def write_lines(self, lines, path=None, atomic=False, durable=False):
+        """ Writes the provided lines to a file.
+
+        Parameters
+        ----------
+        lines: list
+            The lines to write.
+            
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        atomic: ``False`` (default) or bool
+            Optional parameter, whether the file is written to a temporary file and renamed into
+            place, so readers never observe a partially written file.
+
+        durable: ``False`` (default) or bool
+            Optional parameter, whether the data is flushed to disk (``fsync``) before returning.
+        """
+        path = self._path if path is None else path
+        self._validate_params((lines, path), (list, str), 'write lines')
+        self._write_handler(path, 'writelines', lines, atomic, durable)
+
+    def clear_file_content(self, path=None):
+        """ Clears the file content.
+
+        Parameters
+        ----------
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+        """
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'clear content')
+        self._discard_pending(path)
         self._op_handler(path, 'write')
 
+    def iter_chunks(self, size=CHUNK_SIZE, path=None):
+        """ Iterates over the file content in fixed-size chunks.
+
+        Parameters
+        ----------
+        size: ``CHUNK_SIZE`` (default) or int
+            Optional parameter, the maximum number of characters per chunk.
+                ex: ``65536``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        Returns
+        -------
+        generator
+            The file content, one chunk at a time.
+        """
+        path = self._path if path is None else path
+        self._validate_params((size, path), (int, str), 'read chunks')
+        if size < 1:
+            raise ValueError('Unable to read chunks: invalid parameter')
+        return self._stream_handler(path, 'chunks', size)
+
+    def iter_lines(self, path=None):
+        """ Iterates over the lines of a file.
+
+        Parameters
+        ----------
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        Returns
+        -------
+        generator
+            The lines of the file, one line at a time.
+        """
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'read lines')
+        return self._stream_handler(path, 'lines')
+
+    def process_lines(self, func, merge=None, output_path=None, workers=None, chunk_size=64 * CHUNK_SIZE, path=None):
+        """ Processes the lines of a file in parallel, one byte range per process.
+
+        The file is split into byte ranges of about ``chunk_size`` bytes ending on a line
+        boundary, and ``func`` is called with an iterator over the lines of each range in
+        a process pool, so memory per worker is bounded by what ``func`` retains.
+
+        Parameters
+        ----------
+        func: callable
+            A picklable (module level) function called with an iterator over the lines of a
+            range. Returns a picklable result or, if output_path is provided, an iterable of
+            the output lines of the range.
+                ex: ``count_lines``
+
+        merge: ``None`` (default) or callable
+            Optional parameter, a function called with the list of range results (in file
+            order) returning the merged result.
+                ex: ``sum``
+
+        output_path: ``None`` (default) or str
+            Optional parameter, the path of the file receiving the output lines of every
+            range, in file order. The file is replaced atomically.
+                ex: ``'C:\\Users\\johndoe\\Documents\\output.txt'``
+
+        workers: ``None`` (default) or int
+            Optional parameter, the number of processes (defaults to the number of CPUs).
+                ex: ``8``
+
+        chunk_size: ``64 * CHUNK_SIZE`` (default) or int
+            Optional parameter, the approximate size of a range in bytes.
+                ex: ``16 * 1024 * 1024``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        Returns
+        -------
+        list, object or None
+            The range results in file order, the merged result if merge is provided, or
+            ``None`` if output_path is provided.
+        """
+        op = 'process lines'
+        path = self._path if path is None else path
+        self._validate_params((chunk_size, path), (int, str), op)
+        if output_path is not None:
+            self._validate_params(output_path, str, op)
+        if workers is not None:
+            self._validate_params(workers, int, op)
+        if not callable(func) or (merge is not None and not callable(merge)) or chunk_size < 1 \
+                or (workers is not None and workers < 1) or self._codec(path) is not None:
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        encoding = locale.getpreferredencoding(False)
+        self._flush_pending(path)
+        with self._error_handler():
+            ranges = self._line_ranges(path, chunk_size)
+            parts = [None] * len(ranges)
+            if output_path is not None:
+                base = self._temp_path(output_path)
+                parts = [f'{base}.part{i}' for i in range(len(ranges))]
+            try:
+                args = (repeat(func), repeat(path), [r[0] for r in ranges], [r[1] for r in ranges],
+                        repeat(encoding), parts)
+                if len(ranges) > 1 and workers != 1:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        results = list(executor.map(_process_line_range, *args))
+                else:
+                    results = list(map(_process_line_range, *args))
+                if output_path is not None:
+                    self._concatenate(parts, output_path)
+                    return None
+            finally:
+                for part in parts:
+                    if part is not None:
+                        self._remove_quietly(part)
+        return results if merge is None else merge(results)
+
+    def map_content(self, path=None):
+        """ Maps the file content into memory for zero-copy reads.
+
+        The returned object supports slicing, searching and the buffer protocol
+        (e.g., ``memoryview``) without copying or decoding the file, and can be used
+        as a context manager to release the mapping deterministically.
+
+        Parameters
+        ----------
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+
+        Returns
+        -------
+        mmap.mmap or memoryview
+            A read-only map of the file content (an empty ``memoryview`` for empty files).
+        """
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'map content')
+        return self._op_handler(path, 'mmap')
+
+    def read_bytes(self, path=None):
+        """ Reads the file content as bytes.
+
+        Parameters
+        ----------
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.bin'``
+
+        Returns
+        -------
+        bytes
+            The file content.
+        """
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'read bytes')
+        return self._op_handler(path, 'readbytes')
+
+    def read_into(self, buffer, path=None):
+        """ Reads the file content into a preallocated buffer.
+
+        Reads at most ``len(buffer)`` bytes from the start of the file, so the same
+        buffer can be reused across files without allocating new objects.
+
+        Parameters
+        ----------
+        buffer: bytearray or memoryview
+            The writable buffer to fill.
+                ex: ``bytearray(65536)``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.bin'``
+
+        Returns
+        -------
+        int
+            The number of bytes read into the buffer.
+        """
+        path = self._path if path is None else path
+        self._validate_params((buffer, path), ((bytearray, memoryview), str), 'read into buffer')
+        return self._op_handler(path, 'readinto', buffer)
+
+    def write_bytes(self, content, path=None, atomic=False, durable=False):
+        """ Writes the provided bytes to a file.
+
+        Parameters
+        ----------
+        content: bytes, bytearray or memoryview
+            The content to write.
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.bin'``
+
+        atomic: ``False`` (default) or bool
+            Optional parameter, whether the file is written to a temporary file and renamed into
+            place, so readers never observe a partially written file.
+
+        durable: ``False`` (default) or bool
+            Optional parameter, whether the data is flushed to disk (``fsync``) before returning.
+        """
+        path = self._path if path is None else path
+        self._validate_params((content, path), (BYTES_TYPES, str), 'write bytes')
+        self._write_handler(path, 'writebytes', content, atomic, durable)
+
+    def append_bytes(self, content, path=None):
+        """ Appends the provided bytes to a file.
+
+        Parameters
+        ----------
+        content: bytes, bytearray or memoryview
+            The content to append.
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.bin'``
+        """
+        path = self._path if path is None else path
+        self._validate_params((content, path), (BYTES_TYPES, str), 'append bytes')
+        self._op_handler(path, 'appendbytes', content)
+
+    def open_appender(self, max_handles=64, buffering=CHUNK_SIZE, flush_interval=None, flush_size=None):
+        """ Opens an appender that keeps frequently appended files open.
+
+        Unlike ``append_content``, which opens and closes the file on every call, the
+        appender keeps up to ``max_handles`` files open and closes the least recently
+        used one when the limit is reached. Close the appender (or use it as a context
+        manager) to flush and close all handles.
+
+        Parameters
+        ----------
+        max_handles: ``64`` (default) or int
+            Optional parameter, the maximum number of files kept open at the same time.
+                ex: ``256``
+
+        buffering: ``CHUNK_SIZE`` (default) or int
+            Optional parameter, the write buffer size of each open file in bytes.
+                ex: ``65536``
+
+        flush_interval: ``None`` (default) or float
+            Optional parameter, the number of seconds between background flushes of all open files.
+                ex: ``1.0``
+
+        flush_size: ``None`` (default) or int
+            Optional parameter, the number of characters appended to a file before it is flushed.
+                ex: ``1048576``
+
+        Returns
+        -------
+        FileAppender
+            The appender, see ``FileAppender.append``.
+        """
+        return FileAppender(self, max_handles, buffering, flush_interval, flush_size)
+
+    @contextmanager
+    def group_commit(self, workers=WORKERS):
+        """ Batches the directory flushes of durable writes issued within a ``with`` block.
+
+        Durable writes issued by the current thread inside the block flush their file as
+        usual, but their renames and directory flushes are deferred (writes from other threads
+        are not affected). When the block exits, atomic writes are renamed into place and each
+        parent directory is flushed once, on a thread pool. Atomic writes therefore become
+        visible when the block exits, and are discarded if the block raises an exception.
+
+        Parameters
+        ----------
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of directories flushed at the same time.
+                ex: ``16``
+        """
+        self._validate_params(workers, int, 'group commit')
+        group = self._group_commit
+        group.depth = getattr(group, 'depth', 0) + 1
+        if group.depth == 1:
+            group.pending = []
+        try:
+            yield
+        except BaseException:
+            pending = self._end_group_commit()
+            if pending is not None:
+                self._discard_group_commit(pending)
+            raise
+        else:
+            pending = self._end_group_commit()
+            if pending is not None:
+                self._commit_group_commit(pending, workers)
+
     # --- Directory Operations Methods ---
 
     def list_directory_contents(self, path=None):
@@ -460,6 +1587,304 @@ class FileManager:
         self._validate_params(path, str, 'list directory')
         return self._op_handler(path, 'listdir')
 
+    def walk_directory(self, extensions=None, max_depth=None, follow_symlinks=False, path=None, onerror=None):
+        """ Recursively iterates over the entries of a directory tree.
+
+        Entries are built from ``os.scandir``, so the type, size and modification time
+        are available without an extra ``is_file``/``is_directory`` call per entry.
+        The entries of a directory are yielded before descending into its subdirectories.
+        As with ``os.walk``, subdirectories that cannot be listed are skipped.
+
+        Parameters
+        ----------
+        extensions: ``None`` (default), str or iterable of str
+            Optional parameter, only yields files with these extensions (as returned by ``get_file_extension``).
+                ex: ``'.txt'`` or ``['.csv', '.tsv']``
+
+        max_depth: ``None`` (default) or int
+            Optional parameter, the number of subdirectory levels to descend (``0`` lists only the top level).
+                ex: ``2``
+
+        follow_symlinks: ``False`` (default) or bool
+            Optional parameter, whether symbolic links are resolved and linked directories descended.
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        onerror: ``None`` (default) or callable
+            Optional parameter, called with the ``OSError`` of each subdirectory that cannot
+            be listed; it may raise to stop the walk. Errors listing ``path`` itself are raised.
+
+        Returns
+        -------
+        generator
+            ``FileEntry(path, name, type, size, mtime_ns, inode, device)`` tuples, where type
+            is one of ``'file'``, ``'directory'``, ``'symlink'`` or ``'other'``.
+        """
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'walk directory')
+        extensions = self._validate_walk_params(extensions, max_depth, 'walk directory', onerror)
+        self._flush_pending(path, tree=True)
+        return self._walk_handler(path, extensions, max_depth, follow_symlinks, onerror)
+
+    def scan_directory(self, workers=WORKERS, ordered=False, extensions=None, max_depth=None,
+                       follow_symlinks=False, path=None, onerror=None):
+        """ Recursively iterates over the entries of a directory tree, listing directories concurrently.
+
+        Directory listings run on a bounded thread pool, which hides per-directory latency
+        on slow or network filesystems while still producing a single stream of entries.
+
+        Parameters
+        ----------
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of directories listed at the same time.
+                ex: ``16``
+
+        ordered: ``False`` (default) or bool
+            Optional parameter, whether entries are yielded in the same order as ``walk_directory``
+            (otherwise each directory is yielded as soon as its listing completes).
+
+        extensions: ``None`` (default), str or iterable of str
+            Optional parameter, only yields files with these extensions (as returned by ``get_file_extension``).
+                ex: ``'.txt'`` or ``['.csv', '.tsv']``
+
+        max_depth: ``None`` (default) or int
+            Optional parameter, the number of subdirectory levels to descend (``0`` lists only the top level).
+                ex: ``2``
+
+        follow_symlinks: ``False`` (default) or bool
+            Optional parameter, whether symbolic links are resolved and linked directories descended.
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        onerror: ``None`` (default) or callable
+            Optional parameter, called with the ``OSError`` of each subdirectory that cannot
+            be listed (see ``walk_directory``).
+
+        Returns
+        -------
+        generator
+            ``FileEntry(path, name, type, size, mtime_ns, inode, device)`` tuples.
+        """
+        path = self._path if path is None else path
+        self._validate_params((workers, path), (int, str), 'scan directory')
+        extensions = self._validate_walk_params(extensions, max_depth, 'scan directory', onerror)
+        self._flush_pending(path, tree=True)
+        return self._scan_handler(path, extensions, max_depth, follow_symlinks, workers, ordered, onerror)
+
+    def search_content(self, pattern, literal=False, extensions=None, first_match_only=False,
+                       workers=WORKERS, path=None, onerror=None):
+        """ Searches the content of the files in a directory tree for a pattern.
+
+        Files are searched in parallel as bytes, without decoding them: each file is first
+        scanned through a memory map, and only files containing a match are read line by
+        line. Only matching lines are decoded. Files and subdirectories that cannot be read
+        (e.g., deleted during the search) are skipped.
+
+        Parameters
+        ----------
+        pattern: str
+            The regular expression (or literal text) to search for, matched line by line.
+                ex: ``'ERROR|WARN'``
+
+        literal: ``False`` (default) or bool
+            Optional parameter, whether the pattern is matched as literal text.
+
+        extensions: ``None`` (default), str or iterable of str
+            Optional parameter, only searches files with these extensions (as returned by ``get_file_extension``).
+                ex: ``'.log'`` or ``['.txt', '.csv']``
+
+        first_match_only: ``False`` (default) or bool
+            Optional parameter, whether only the first matching line of each file is returned.
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of files searched at the same time.
+                ex: ``16``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        onerror: ``None`` (default) or callable
+            Optional parameter, called with the ``OSError`` of each file or subdirectory that
+            cannot be read; it may raise to stop the search.
+
+        Returns
+        -------
+        generator
+            ``SearchMatch(path, line_number, line)`` tuples with zero-based line numbers and
+            without line terminators. Matches of a file are in order; files are in completion order.
+        """
+        path = self._path if path is None else path
+        self._validate_params((pattern, workers, path), (str, int, str), 'search content')
+        extensions = self._validate_walk_params(extensions, None, 'search content', onerror)
+        encoding = locale.getpreferredencoding(False)
+        try:
+            pattern = pattern.encode(encoding)
+            regex = re.compile(re.escape(pattern) if literal else pattern, re.MULTILINE)
+        except (UnicodeEncodeError, re.error) as e:
+            raise ValueError(f'Unable to search content: {e}') from None
+        self._flush_pending(path, tree=True)
+        files = (entry.path for entry in self._walk_handler(path, extensions, None, False, onerror)
+                 if entry.type == 'file')
+        search = functools.partial(self._search_file, regex=regex, first_match_only=first_match_only,
+                                   encoding=encoding)
+        return self._search_handler(search, files, workers, onerror)
+
+    def take_snapshot(self, previous=None, skip_unchanged=False, path=None):
+        """ Records the metadata of every entry in a directory tree.
+
+        With ``skip_unchanged``, subdirectories whose modification time and inode match the
+        previous snapshot are not listed again; their files are copied from the previous
+        snapshot and their subdirectories are stat'ed and compared in turn. A directory's
+        modification time only changes when entries are added, removed or renamed directly
+        in it, so this shortcut misses files modified in place.
+
+        Parameters
+        ----------
+        previous: ``None`` (default) or dict
+            Optional parameter, an earlier snapshot of the same tree.
+
+        skip_unchanged: ``False`` (default) or bool
+            Optional parameter, whether unchanged subdirectories are copied from ``previous``.
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        Returns
+        -------
+        dict
+            The ``SnapshotEntry(type, size, mtime_ns, inode)`` of each entry, keyed by its path
+            relative to the directory.
+        """
+        path = self._path if path is None else path
+        self._validate_params(path, str, 'take snapshot')
+        self._flush_pending(path, tree=True)
+        if previous is not None and not isinstance(previous, dict):
+            raise ValueError('Unable to take snapshot: invalid parameter')
+        children = {}
+        if previous and skip_unchanged:
+            for key in previous:
+                children.setdefault(os.path.dirname(key), []).append(key)
+        snapshot = {}
+        with self._error_handler():
+            stack = [(path, '')]
+            while stack:
+                directory, relative = stack.pop()
+                for entry in self._list_entries(directory):
+                    key = os.path.join(relative, entry.name) if relative else entry.name
+                    record = SnapshotEntry(entry.type, entry.size, entry.mtime_ns, entry.inode)
+                    snapshot[key] = record
+                    if entry.type != 'directory':
+                        continue
+                    old = previous.get(key) if children else None
+                    if old is not None and (old.mtime_ns, old.inode) == (record.mtime_ns, record.inode):
+                        self._copy_snapshot_children(path, previous, children, key, snapshot, stack)
+                    else:
+                        stack.append((entry.path, key))
+        return snapshot
+
+    def save_snapshot(self, snapshot, snapshot_path):
+        """ Saves a snapshot to a compact file.
+
+        Parameters
+        ----------
+        snapshot: dict
+            The snapshot, as returned by ``take_snapshot``.
+
+        snapshot_path: str
+            The path of the snapshot file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\tree.snapshot'``
+        """
+        self._validate_params(snapshot_path, str, 'save snapshot')
+        if not isinstance(snapshot, dict):
+            raise ValueError('Unable to save snapshot: invalid parameter')
+        compressor = zlib.compressobj()
+        chunks = [SNAPSHOT_MAGIC]
+        for key, entry in snapshot.items():
+            name = os.fsencode(key)
+            record = SNAPSHOT_RECORD.pack(len(name), SNAPSHOT_TYPES.index(entry.type), entry.size,
+                                          entry.mtime_ns, entry.inode)
+            chunks.append(compressor.compress(record + name))
+        chunks.append(compressor.flush())
+        self._write_handler(snapshot_path, 'writebytes', b''.join(chunks), atomic=True)
+
+    def load_snapshot(self, snapshot_path):
+        """ Loads a snapshot from a file.
+
+        Parameters
+        ----------
+        snapshot_path: str
+            The path of the snapshot file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\tree.snapshot'``
+
+        Returns
+        -------
+        dict
+            The snapshot, as returned by ``take_snapshot``.
+        """
+        self._validate_params(snapshot_path, str, 'load snapshot')
+        data = self._op_handler(snapshot_path, 'readbytes')
+        try:
+            if not data.startswith(SNAPSHOT_MAGIC):
+                raise ValueError
+            data = zlib.decompress(data[len(SNAPSHOT_MAGIC):])
+            snapshot, offset = {}, 0
+            while offset < len(data):
+                length, type_, size, mtime_ns, inode = SNAPSHOT_RECORD.unpack_from(data, offset)
+                offset += SNAPSHOT_RECORD.size
+                key = os.fsdecode(data[offset:offset + length])
+                offset += length
+                snapshot[key] = SnapshotEntry(SNAPSHOT_TYPES[type_], size, mtime_ns, inode)
+        except (ValueError, IndexError, struct.error, zlib.error):
+            raise ValueError('Unable to load snapshot: invalid snapshot file') from None
+        return snapshot
+
+    def diff_snapshots(self, old, new):
+        """ Compares two snapshots of a directory tree.
+
+        Entries that disappeared and reappeared under another path with the same inode,
+        size and modification time are reported as renamed. Directories are only reported
+        as added, removed or renamed, since their modification time changes with their contents.
+
+        Parameters
+        ----------
+        old: dict
+            The earlier snapshot.
+
+        new: dict
+            The later snapshot.
+
+        Returns
+        -------
+        SnapshotDiff
+            The sorted ``added``, ``removed`` and ``modified`` paths, and the sorted
+            ``renamed`` list of ``(old_path, new_path)`` pairs.
+        """
+        if not (isinstance(old, dict) and isinstance(new, dict)):
+            raise ValueError('Unable to diff snapshots: invalid parameter')
+        added = [key for key in new if key not in old]
+        removed = [key for key in old if key not in new]
+        modified = [key for key, entry in new.items()
+                    if key in old and entry.type != 'directory' and entry != old[key]]
+        removed_by_identity = {}
+        for key in removed:
+            removed_by_identity.setdefault(old[key], []).append(key)
+        renamed = []
+        for key in added:
+            candidates = removed_by_identity.get(new[key])
+            if candidates:
+                renamed.append((candidates.pop(), key))
+        renamed_old = {old_key for old_key, _ in renamed}
+        renamed_new = {new_key for _, new_key in renamed}
+        return SnapshotDiff(sorted(key for key in added if key not in renamed_new),
+                            sorted(key for key in removed if key not in renamed_old),
+                            sorted(modified), sorted(renamed))
+
     def create_directory(self, path=None):
         """ Creates a new directory.
 
@@ -490,7 +1915,38 @@ class FileManager:
         self._validate_params((new_path, path), (str, str), 'rename directory')
         self._op_handler(path, 'rename', new_path)
 
-    def delete_directory(self, path=None):
+    def copy_directory(self, new_path, workers=WORKERS, path=None):
+        """ Copies an existing directory and its contents.
+
+        Subdirectories and symbolic links are recreated first, then the files are copied
+        concurrently in the same way as ``copy_file``.
+
+        Parameters
+        ----------
+        new_path: str
+            The path of the new directory (must not exist).
+                ex: ``'C:\\Users\\johndoe\\Documents\\folder2'``
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of files copied at the same time.
+                ex: ``16``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents\\folder1'``
+        """
+        path = self._path if path is None else path
+        self._validate_params((new_path, workers, path), (str, int, str), 'copy directory')
+        self._flush_pending(path, tree=True)
+        try:
+            with self._measure('copytree', path) as size, self._error_handler():
+                copied = self._copy_tree(path, new_path, workers)
+                if size is not None:
+                    size[0] = copied
+        finally:
+            self._path_changed(new_path, tree=True)
+
+    def delete_directory(self, path=None, recursive=False, workers=WORKERS):
         """ Deletes an existing directory.
 
         Parameters
@@ -498,10 +1954,527 @@ class FileManager:
         path: ``None`` (default) or str
             Optional parameter, the path of the directory.
                 ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        recursive: ``False`` (default) or bool
+            Optional parameter, whether the directory is deleted with all of its contents.
+            Entries are deleted relative to open directory descriptors, without following
+            symbolic links, and subdirectories at every depth are deleted concurrently (each
+            directory is removed once its subdirectories are). Failures do not stop the
+            deletion and are reported instead.
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of subdirectories deleted at the same time.
+                ex: ``16``
+
+        Returns
+        -------
+        ``None`` or DeleteReport
+            When recursive, a ``DeleteReport(files, directories, errors)`` with the number of
+            deleted files and directories, and a list of ``(path, exception)`` failures.
+        """
+        path = self._path if path is None else path
+        self._validate_params((path, workers), (str, int), 'delete directory')
+        if not recursive:
+            return self._op_handler(path, 'rmdir')
+        self._flush_pending(path, tree=True)
+        try:
+            with self._error_handler():
+                return self._delete_tree(path, workers)
+        finally:
+            self._path_changed(path, tree=True)
+
+    def disk_usage(self, workers=WORKERS, path=None, use_cache=True):
+        """ Computes the disk usage of every directory in a directory tree.
+
+        Each level of the tree is scanned concurrently. The totals of the entries directly
+        inside each directory are cached by the directory's modification time, so repeated
+        calls only rescan directories whose entries changed (or that contain files written
+        through this instance). A directory's modification time only changes when entries
+        are added, removed or renamed in it, so cached totals miss files modified in place
+        by other programs; use ``use_cache=False`` when exact sizes are required.
+
+        Parameters
+        ----------
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of directories scanned at the same time.
+                ex: ``16``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        use_cache: ``True`` (default) or bool
+            Optional parameter, whether cached directory totals are reused (otherwise every
+            directory is rescanned and the cache is refreshed).
+
+        Returns
+        -------
+        dict
+            A ``DiskUsage(apparent_size, allocated_size, files, directories)`` of the subtree
+            of every directory (including the top directory), sorted by path. Sizes are in
+            bytes, and symbolic links are counted as files but never followed.
+        """
+        path = self._path if path is None else path
+        self._validate_params((workers, path), (int, str), 'compute disk usage')
+        if workers < 1:
+            raise ValueError('Unable to compute disk usage: invalid parameter')
+        self._flush_pending(path, tree=True)
+        with self._error_handler():
+            return self._disk_usage(path, workers, use_cache)
+
+    def largest_directories(self, count=10, workers=WORKERS, path=None, use_cache=True):
+        """ Returns the directories with the largest disk usage in a directory tree.
+
+        Parameters
+        ----------
+        count: ``10`` (default) or int
+            Optional parameter, the maximum number of directories returned.
+                ex: ``20``
+
+        workers: ``WORKERS`` (default) or int
+            Optional parameter, the maximum number of directories scanned at the same time.
+                ex: ``16``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        use_cache: ``True`` (default) or bool
+            Optional parameter, whether cached directory totals are reused (see ``disk_usage``).
+
+        Returns
+        -------
+        list
+            The ``(path, DiskUsage)`` pairs, sorted by descending allocated size.
+        """
+        self._validate_params(count, int, 'find largest directories')
+        usage = self.disk_usage(workers, path, use_cache)
+        return heapq.nlargest(count, usage.items(), key=lambda item: item[1].allocated_size)
+
+    # --- Performance Tuning Methods ---
+
+    def enable_stat_cache(self, ttl=1.0, max_size=4096):
+        """ Enables caching of path metadata for the path validation methods.
+
+        Cached results are shared by ``is_file``, ``is_directory``, ``is_valid_path`` and
+        ``path_exists``, expire after ``ttl`` seconds, and are evicted least recently used
+        first. Operations performed through this instance invalidate the affected paths;
+        changes made by other processes are only seen once an entry expires.
+
+        Parameters
+        ----------
+        ttl: ``1.0`` (default) or float
+            Optional parameter, the number of seconds a cached result stays valid.
+                ex: ``5.0``
+
+        max_size: ``4096`` (default) or int
+            Optional parameter, the maximum number of cached paths.
+                ex: ``100000``
+        """
+        self._validate_params((ttl, max_size), ((int, float), int), 'enable stat cache')
+        if ttl < 0 or max_size < 1:
+            raise ValueError('Unable to enable stat cache: invalid parameter')
+        with self._lock:
+            self._stat_cache = OrderedDict()
+            self._stat_cache_ttl = ttl
+            self._stat_cache_size = max_size
+            self._stat_cache_hits = 0
+            self._stat_cache_misses = 0
+
+    def disable_stat_cache(self):
+        """ Disables and clears the path metadata cache. """
+        with self._lock:
+            self._stat_cache = None
+
+    def stat_cache_info(self):
+        """ Returns the path metadata cache statistics.
+
+        Returns
+        -------
+        dict
+            The ``enabled`` flag, ``hits``, ``misses``, current ``size``, ``max_size`` and ``ttl``.
+        """
+        with self._lock:
+            return {
+                'enabled': self._stat_cache is not None,
+                'hits': self._stat_cache_hits,
+                'misses': self._stat_cache_misses,
+                'size': len(self._stat_cache) if self._stat_cache is not None else 0,
+                'max_size': self._stat_cache_size,
+                'ttl': self._stat_cache_ttl,
+            }
+
+    def enable_index(self, database_path=':memory:', path=None):
+        """ Enables a queryable SQLite index of a directory tree.
+
+        The index records the metadata of every entry and answers queries by extension,
+        name pattern, size and modification time without walking the tree (see
+        ``FileIndex.query``). It is refreshed incrementally with ``FileIndex.refresh`` and
+        kept in sync with the operations performed through this instance.
+
+        Parameters
+        ----------
+        database_path: ``':memory:'`` (default) or str
+            Optional parameter, the path of the SQLite database file.
+                ex: ``'C:\\Users\\johndoe\\index.sqlite'``
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the indexed directory.
+                ex: ``'C:\\Users\\johndoe\\Documents'``
+
+        Returns
+        -------
+        FileIndex
+            The index, also available as the ``index`` attribute.
         """
         path = self._path if path is None else path
-        self._validate_params(path, str, 'delete directory')
-        self._op_handler(path, 'rmdir')
+        self._validate_params((database_path, path), (str, str), 'enable index')
+        if sqlite3 is None:
+            raise ImportError('Unable to enable index: the sqlite3 module is not available')
+        self.disable_index()
+        index = FileIndex(self, database_path, path)
+        try:
+            index.refresh()
+        except BaseException:
+            index.close()
+            raise
+        self._index = index
+        return index
+
+    def disable_index(self):
+        """ Disables and closes the directory tree index. """
+        index, self._index = self._index, None
+        if index is not None:
+            index.close()
+
+    def enable_compression(self, level=None, background_threshold=None):
+        """ Enables transparent compression of files based on their extension.
+
+        Files with a ``.gz``, ``.bz2`` or ``.xz`` extension (as returned by
+        ``get_file_extension``) are compressed and decompressed in streaming mode by the
+        read, write and append methods, including ``iter_chunks``, ``iter_lines``,
+        ``read_line``, ``read_line_range`` and ``search_content`` (which stream the
+        decompressed lines instead of using a line index). Memory maps operate on the raw
+        file, and ``build_line_index``, ``read_new_lines``, ``follow_lines`` and
+        ``process_lines`` raise ``ValueError`` for compressed files.
+
+        Parameters
+        ----------
+        level: ``None`` (default) or int
+            Optional parameter, the compression level from ``0`` to ``9`` (``None`` uses
+            each codec's default).
+                ex: ``6``
+
+        background_threshold: ``None`` (default) or int
+            Optional parameter, the size (in characters or bytes) from which writes are
+            compressed on a worker thread while the compressed data is written.
+                ex: ``16 * 1024 ** 2``
+        """
+        if not (level is None or (isinstance(level, int) and 0 <= level <= 9)) or not (
+                background_threshold is None or (isinstance(background_threshold, int) and background_threshold > 0)):
+            raise ValueError('Unable to enable compression: invalid parameter')
+        self._compression = True
+        self._compression_level = level
+        self._compression_threshold = background_threshold
+
+    def disable_compression(self):
+        """ Disables transparent compression. """
+        self._compression = False
+
+    def enable_metrics(self):
+        """ Enables per-operation metrics for the file operations.
+
+        Every operation performed through ``_op_handler`` (e.g., ``read``, ``write``,
+        ``append``, ``listdir``, ``mkdir``, ``rename``, ``remove``), as well as streaming
+        reads, atomic or durable writes and copies, records its call count, error count,
+        bytes (or characters) moved and a latency histogram.
+        """
+        with self._lock:
+            if self._metrics is None:
+                self._metrics = {}
+
+    def disable_metrics(self):
+        """ Disables and clears the per-operation metrics. """
+        with self._lock:
+            self._metrics = None
+
+    def get_metrics(self):
+        """ Returns a snapshot of the per-operation metrics.
+
+        Returns
+        -------
+        dict
+            Per operation, the ``count``, ``errors``, ``bytes``, ``total_time`` and
+            ``max_time`` (in seconds), and a ``histogram`` mapping latency upper bounds
+            (in seconds) to call counts.
+        """
+        with self._lock:
+            metrics = self._metrics or {}
+            return {op: dict(record, histogram=dict(zip(map(str, LATENCY_BUCKETS), record['histogram'])))
+                    for op, record in metrics.items()}
+
+    def export_metrics(self, metrics_path):
+        """ Saves a snapshot of the per-operation metrics as JSON.
+
+        Parameters
+        ----------
+        metrics_path: str
+            The path of the JSON file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\metrics.json'``
+        """
+        self._validate_params(metrics_path, str, 'export metrics')
+        content = json.dumps(self.get_metrics(), indent=2, sort_keys=True)
+        self._write_handler(metrics_path, 'write', content, atomic=True)
+
+    def add_metrics_hook(self, hook):
+        """ Registers a callback invoked after every measured operation.
+
+        Hooks are called with ``(op, path, elapsed, size, error)``, where error is the
+        raised exception (or ``None``). Exceptions raised by hooks are ignored.
+
+        Parameters
+        ----------
+        hook: callable
+            The callback.
+        """
+        if not callable(hook):
+            raise ValueError('Unable to add metrics hook: invalid parameter')
+        with self._lock:
+            self._metrics_hooks = self._metrics_hooks + [hook]
+
+    def remove_metrics_hook(self, hook):
+        """ Unregisters a callback registered with ``add_metrics_hook``.
+
+        Parameters
+        ----------
+        hook: callable
+            The callback.
+        """
+        with self._lock:
+            self._metrics_hooks = [h for h in self._metrics_hooks if h is not hook]
+
+    def enable_write_behind(self, flush_interval=1.0, max_pending_size=16 * CHUNK_SIZE):
+        """ Enables write-behind caching of the content written with ``write_content``.
+
+        Non-durable ``write_content`` calls only record the latest content of each file in
+        memory, so repeated writes of a file are coalesced into a single disk write. Pending
+        content is written every ``flush_interval`` seconds, once the pending content reaches
+        ``max_pending_size`` characters, and on ``flush()`` or ``disable_write_behind()``.
+        ``read_content`` returns the pending content, ``append_content`` appends to it, and the
+        other methods accessing a file with pending content write it to disk first. Files
+        are only created on disk when their pending content is written.
+
+        Errors writing the pending content are raised by ``flush()`` (pending content that
+        cannot be written is retried on the next flush). Pending content not flushed before
+        the process exits is lost.
+
+        Parameters
+        ----------
+        flush_interval: ``1.0`` (default), float or ``None``
+            Optional parameter, the interval in seconds between background flushes, or
+            ``None`` to only flush on size pressure and on ``flush()``.
+                ex: ``0.5``
+
+        max_pending_size: ``16 * CHUNK_SIZE`` (default), int or ``None``
+            Optional parameter, the number of pending characters triggering a flush, or
+            ``None`` for no limit.
+                ex: ``64 * 1024 * 1024``
+        """
+        op = 'enable write-behind'
+        if flush_interval is not None and not (isinstance(flush_interval, (int, float)) and flush_interval > 0):
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        if max_pending_size is not None:
+            self._validate_params(max_pending_size, int, op)
+            if max_pending_size < 1:
+                raise ValueError(f'Unable to {op}: invalid parameter')
+        self.disable_write_behind()
+        with self._lock:
+            self._write_behind, self._write_behind_size = {}, 0
+            self._write_behind_limit = max_pending_size
+            if flush_interval is not None:
+                self._write_behind_stop = threading.Event()
+                self._write_behind_thread = threading.Thread(
+                    target=self._flush_periodically, args=(flush_interval, self._write_behind_stop), daemon=True)
+                self._write_behind_thread.start()
+
+    def flush(self):
+        """ Writes the pending write-behind content to disk. """
+        self._flush_pending()
+
+    def disable_write_behind(self):
+        """ Flushes the pending content and disables write-behind caching. """
+        with self._lock:
+            stop, thread = self._write_behind_stop, self._write_behind_thread
+            self._write_behind_stop = self._write_behind_thread = None
+        if stop is not None:
+            stop.set()
+            thread.join()
+        with self._flush_lock:
+            self._write_pending()
+            with self._lock:
+                self._write_behind, self._write_behind_size = None, 0
+
+    def _stat(self, path):
+        if self._stat_cache is None:
+            return self._stat_uncached(path)
+        key = os.path.abspath(path)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._stat_cache.get(key)
+            if cached is not None and now - cached[0] < self._stat_cache_ttl:
+                self._stat_cache.move_to_end(key)
+                self._stat_cache_hits += 1
+                return cached[1]
+            self._stat_cache_misses += 1
+        st = self._stat_uncached(path)
+        with self._lock:
+            if self._stat_cache is not None:
+                self._stat_cache[key] = (now, st)
+                self._stat_cache.move_to_end(key)
+                while len(self._stat_cache) > self._stat_cache_size:
+                    self._stat_cache.popitem(last=False)
+        return st
+
+    def _stat_uncached(self, path):
+        try:
+            return os.stat(path)
+        except (OSError, ValueError):
+            return None
+
+    def _path_changed(self, path, new_path=None, tree=False):
+        index = self._index
+        if index is not None:
+            index._sync(path, new_path, tree)
+        if self._stat_cache is None and not (self._line_indexes or self._disk_usage_cache):
+            return
+        paths = [os.path.abspath(p) for p in (path, new_path) if p]
+        prefixes = tuple(os.path.join(p, '') for p in paths)
+        with self._lock:
+            for p in paths:
+                self._line_indexes.pop(p, None)
+                self._disk_usage_cache.pop(os.path.dirname(p), None)
+            if tree and self._disk_usage_cache:
+                for key in [key for key in self._disk_usage_cache if key.startswith(prefixes) or key in paths]:
+                    del self._disk_usage_cache[key]
+            if self._stat_cache is None:
+                return
+            for p in paths:
+                self._stat_cache.pop(p, None)
+            if tree:
+                for key in [key for key in self._stat_cache if key.startswith(prefixes)]:
+                    del self._stat_cache[key]
+
+    def _tail_lines(self, path):
+        key = os.path.abspath(path)
+        encoding = locale.getpreferredencoding(False)
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            previous = self._tail_offsets.get(key)
+            offset = 0
+            if previous is not None and previous[:2] == (st.st_dev, st.st_ino) and previous[2] <= st.st_size:
+                offset = previous[2]
+            f.seek(offset)
+            self._tail_offsets[key] = (st.st_dev, st.st_ino, offset)
+            remainder = b''
+            for block in iter(functools.partial(f.read, CHUNK_SIZE), b''):
+                data = remainder + block
+                end = data.rfind(b'\n') + 1
+                if not end:
+                    remainder = data
+                    continue
+                content = data[:end].decode(encoding).replace('\r\n', '\n')
+                remainder, offset = data[end:], offset + end
+                self._tail_offsets[key] = (st.st_dev, st.st_ino, offset)
+                for line in content.split('\n')[:-1]:
+                    yield line + '\n'
+
+    def _follow_handler(self, path, interval, timeout):
+        with self._error_handler():
+            last_line_time = time.monotonic()
+            while True:
+                lines = 0
+                try:
+                    for line in self._tail_lines(path):
+                        lines += 1
+                        yield line
+                except FileNotFoundError:
+                    pass
+                now = time.monotonic()
+                if lines:
+                    last_line_time = now
+                elif timeout is not None and now - last_line_time >= timeout:
+                    return
+                time.sleep(interval)
+
+    def _indexed_lines(self, path, start, stop):
+        with self._error_handler():
+            if self._codec(path) is not None:
+                with self._open(path, 'r') as f:
+                    return list(islice(f, start, max(start, stop)))
+            offsets = self._line_index(path)
+            if start >= min(stop, len(offsets)):
+                return []
+            encoding = locale.getpreferredencoding(False)
+            with open(path, 'rb') as f:
+                f.seek(offsets[start])
+                lines = [f.readline() for _ in range(min(stop, len(offsets)) - start)]
+            return [line.decode(encoding).replace('\r\n', '\n') for line in lines]
+
+    def _line_index(self, path, persist=False):
+        key = os.path.abspath(path)
+        st = os.stat(path)
+        with self._lock:
+            cached = self._line_indexes.get(key)
+        if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+            offsets = cached[2]
+            if persist:
+                self._save_line_index(key, st, offsets)
+            return offsets
+        offsets = self._load_line_index(key, st)
+        if offsets is None:
+            offsets = self._scan_line_offsets(key, st.st_size)
+            if persist:
+                self._save_line_index(key, st, offsets)
+        with self._lock:
+            self._line_indexes[key] = (st.st_size, st.st_mtime_ns, offsets)
+        return offsets
+
+    def _scan_line_offsets(self, path, size):
+        offsets = array('Q', [0] if size else [])
+        with open(path, 'rb') as f:
+            base = 0
+            chunk = f.read(CHUNK_SIZE)
+            while chunk:
+                position = chunk.find(b'\n')
+                while position != -1:
+                    offsets.append(base + position + 1)
+                    position = chunk.find(b'\n', position + 1)
+                base += len(chunk)
+                chunk = f.read(CHUNK_SIZE)
+        if offsets and offsets[-1] >= base:
+            offsets.pop()
+        return offsets
+
+    def _load_line_index(self, path, st):
+        try:
+            with open(path + LINE_INDEX_SUFFIX, 'rb') as f:
+                magic, size, mtime_ns, count = LINE_INDEX_HEADER.unpack(f.read(LINE_INDEX_HEADER.size))
+                if (magic, size, mtime_ns) != (b'FMLI', st.st_size, st.st_mtime_ns):
+                    return None
+                offsets = array('Q')
+                offsets.fromfile(f, count)
+        except (OSError, EOFError, struct.error):
+            return None
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+        return offsets
+
+    def _save_line_index(self, path, st, offsets):
+        if sys.byteorder != 'little':
+            offsets = array('Q', offsets)
+            offsets.byteswap()
+        header = LINE_INDEX_HEADER.pack(b'FMLI', st.st_size, st.st_mtime_ns, len(offsets))
+        self._write_handler(path + LINE_INDEX_SUFFIX, 'writebytes', header + offsets.tobytes(), atomic=True)
 
     def _validate_params(self, params, types, op):
         if not isinstance(params, (list, tuple, dict, set)):
@@ -512,29 +2485,938 @@ class FileManager:
             if not (param and isinstance(param, type_)):
                 raise ValueError(f'Unable to {op}: invalid parameter')
 
+    def _validate_batch(self, paths, op):
+        if isinstance(paths, (str, bytes)):
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        try:
+            paths = paths if isinstance(paths, (list, tuple)) else list(paths)
+        except TypeError:
+            raise ValueError(f'Unable to {op}: invalid parameter') from None
+        if not all(isinstance(path, str) and path for path in paths):
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        return paths
+
+    def _validate_uncompressed(self, path, op):
+        if self._codec(path) is not None:
+            raise ValueError(f'Unable to {op}: not supported for compressed files')
+
+    def _validate_walk_params(self, extensions, max_depth, op, onerror=None):
+        if isinstance(extensions, str):
+            extensions = (extensions,)
+        if extensions is not None:
+            extensions = frozenset(extensions)
+            for extension in extensions:
+                self._validate_params(extension, str, op)
+        if max_depth is not None and not (isinstance(max_depth, int) and max_depth >= 0):
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        if onerror is not None and not callable(onerror):
+            raise ValueError(f'Unable to {op}: invalid parameter')
+        return extensions
+
+    def _list_entries(self, directory, follow_symlinks=False):
+        entries = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    st = entry.stat(follow_symlinks=follow_symlinks)
+                except FileNotFoundError:
+                    if not follow_symlinks:
+                        continue
+                    try:
+                        st = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                entries.append(self._list_entry(entry.path, st, entry.name))
+        return entries
+
+    def _list_entry(self, path, st, name=None):
+        if stat.S_ISREG(st.st_mode):
+            type_ = 'file'
+        elif stat.S_ISDIR(st.st_mode):
+            type_ = 'directory'
+        elif stat.S_ISLNK(st.st_mode):
+            type_ = 'symlink'
+        else:
+            type_ = 'other'
+        name = os.path.basename(path) if name is None else name
+        return FileEntry(path, name, type_, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    def _filter_entries(self, entries, extensions, descend):
+        matches, subdirs = [], []
+        for entry in entries:
+            if entry.type == 'directory':
+                if descend:
+                    subdirs.append(entry)
+                if extensions is None:
+                    matches.append(entry)
+            elif extensions is None or os.path.splitext(entry.name)[1] in extensions:
+                matches.append(entry)
+        return matches, subdirs
+
+    def _unvisited_subdirs(self, subdirs, visited):
+        if visited is None:
+            return subdirs
+        unvisited = []
+        for subdir in subdirs:
+            if (subdir.device, subdir.inode) not in visited:
+                visited.add((subdir.device, subdir.inode))
+                unvisited.append(subdir)
+        return unvisited
+
+    def _visited_set(self, path, follow_symlinks):
+        if not follow_symlinks:
+            return None
+        st = os.stat(path)
+        return {(st.st_dev, st.st_ino)}
+
+    def _walk_handler(self, path, extensions, max_depth, follow_symlinks, onerror=None):
+        with self._error_handler():
+            visited = self._visited_set(path, follow_symlinks)
+            stack = [(path, 0)]
+            while stack:
+                directory, depth = stack.pop()
+                descend = max_depth is None or depth < max_depth
+                try:
+                    entries = self._list_entries(directory, follow_symlinks)
+                except OSError as e:
+                    if not depth:
+                        raise
+                    if onerror is not None:
+                        onerror(e)
+                    continue
+                matches, subdirs = self._filter_entries(entries, extensions, descend)
+                for entry in matches:
+                    yield entry
+                for subdir in reversed(self._unvisited_subdirs(subdirs, visited)):
+                    stack.append((subdir.path, depth + 1))
+
+    def _scan_handler(self, path, extensions, max_depth, follow_symlinks, workers, ordered, onerror=None):
+        with self._error_handler():
+            visited = self._visited_set(path, follow_symlinks)
+            executor = ThreadPoolExecutor(max_workers=workers)
+            pending = {}
+
+            def submit(directory, depth):
+                future = executor.submit(self._list_entries, directory, follow_symlinks)
+                pending[future] = depth
+                return future
+
+            try:
+                stack = [submit(path, 0)]
+                while pending:
+                    if ordered:
+                        done = (stack.pop(),)
+                    else:
+                        done = wait(pending, return_when=FIRST_COMPLETED)[0]
+                    for future in done:
+                        depth = pending.pop(future)
+                        descend = max_depth is None or depth < max_depth
+                        try:
+                            entries = future.result()
+                        except OSError as e:
+                            if not depth:
+                                raise
+                            if onerror is not None:
+                                onerror(e)
+                            continue
+                        matches, subdirs = self._filter_entries(entries, extensions, descend)
+                        children = [submit(subdir.path, depth + 1)
+                                    for subdir in self._unvisited_subdirs(subdirs, visited)]
+                        stack.extend(reversed(children))
+                        for entry in matches:
+                            yield entry
+            finally:
+                for future in pending:
+                    future.cancel()
+                executor.shutdown(wait=True)
+
+    def _disk_usage(self, path, workers, use_cache=True):
+        def scan(directory):
+            try:
+                return directory, self._directory_usage(directory, use_cache)
+            except FileNotFoundError:
+                if directory is path:
+                    raise
+                return directory, None
+
+        order, own, children = [], {}, {}
+        level = [path]
+        while level:
+            next_level = []
+            for directory, usage in self._imap_unordered(scan, level, workers):
+                if usage is None:
+                    continue
+                order.append(directory)
+                own[directory] = usage[0]
+                children[directory] = [os.path.join(directory, name) for name in usage[1]]
+                next_level.extend(children[directory])
+            level = next_level
+        totals = {}
+        for directory in reversed(order):
+            subtotals = [own[directory]] + [totals[child] for child in children[directory] if child in totals]
+            totals[directory] = DiskUsage(*map(sum, zip(*subtotals)))
+        return {directory: totals[directory] for directory in sorted(order)}
+
+    def _directory_usage(self, directory, use_cache=True):
+        key = os.path.abspath(directory)
+        mtime_ns = os.stat(directory).st_mtime_ns
+        cached = self._disk_usage_cache.get(key) if use_cache else None
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1:]
+        apparent_size = allocated_size = files = 0
+        subdirectories = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.name)
+                        continue
+                    st = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                apparent_size += st.st_size
+                allocated_size += st.st_blocks * 512 if hasattr(st, 'st_blocks') else st.st_size
+                files += 1
+        usage = DiskUsage(apparent_size, allocated_size, files, len(subdirectories))
+        with self._lock:
+            self._disk_usage_cache[key] = (mtime_ns, usage, tuple(subdirectories))
+        return usage, subdirectories
+
+    def _imap_unordered(self, func, items, workers):
+        executor = ThreadPoolExecutor(max_workers=workers)
+        pending = set()
+        try:
+            for item in items:
+                pending.add(executor.submit(func, item))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+    def _imap_skipping_errors(self, func, items, workers, onerror=None):
+        def run(item):
+            try:
+                return func(item), None
+            except OSError as e:
+                return None, e
+        for result, error in self._imap_unordered(run, items, workers):
+            if error is None:
+                yield result
+            elif onerror is not None:
+                onerror(error)
+
+    def _search_handler(self, search, files, workers, onerror=None):
+        with self._error_handler():
+            for matches in self._imap_skipping_errors(search, files, workers, onerror):
+                for match in matches:
+                    yield match
+
+    def _search_file(self, path, regex, first_match_only, encoding):
+        matches = []
+        compressed = self._codec(path) is not None
+        with self._open(path, 'rb') as f:
+            if not compressed:
+                if not os.fstat(f.fileno()).st_size:
+                    return matches
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    if regex.search(mapped) is None:
+                        return matches
+                f.seek(0)
+            for line_number, line in enumerate(f):
+                if regex.search(line) is not None:
+                    line = line.rstrip(b'\r\n').decode(encoding, errors='replace')
+                    matches.append(SearchMatch(path, line_number, line))
+                    if first_match_only:
+                        break
+        return matches
+
+    def _validate_algorithm(self, algorithm, op):
+        if algorithm not in hashlib.algorithms_available:
+            raise ValueError(f'Unable to {op}: unsupported algorithm {algorithm!r}')
+
+    def _hash_file(self, path, algorithm):
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm)
+            with self._lock:
+                digest = self._hash_cache.get(key)
+            if digest is not None:
+                return digest
+            hasher = hashlib.new(algorithm)
+            buffer = bytearray(min(CHUNK_SIZE, st.st_size) or 1)
+            view = memoryview(buffer)
+            size = f.readinto(buffer)
+            while size:
+                hasher.update(view[:size])
+                size = f.readinto(buffer)
+        digest = hasher.hexdigest()
+        with self._lock:
+            self._hash_cache[key] = digest
+        return digest
+
+    def _rename(self, path, new_path):
+        try:
+            os.rename(path, new_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            self._move_across_devices(path, new_path)
+
+    def _move_across_devices(self, path, new_path):
+        st = os.lstat(path)
+        if stat.S_ISDIR(st.st_mode):
+            self._copy_tree(path, new_path, WORKERS, preserve_times=True)
+            errors = self._delete_tree(path, WORKERS).errors
+            if errors:
+                raise errors[0][1]
+        else:
+            try:
+                self._copy_file(path, new_path, preserve_times=True)
+            except BaseException:
+                self._remove_quietly(new_path)
+                raise
+            os.remove(path)
+
+    def _copy_snapshot_children(self, path, previous, children, key, snapshot, stack):
+        unchanged = [key]
+        while unchanged:
+            for child in children.get(unchanged.pop(), ()):
+                old = previous[child]
+                if old.type != 'directory':
+                    snapshot[child] = old
+                    continue
+                child_path = os.path.join(path, child)
+                try:
+                    entry = self._list_entry(child_path, os.lstat(child_path))
+                except FileNotFoundError:
+                    continue
+                snapshot[child] = SnapshotEntry(entry.type, entry.size, entry.mtime_ns, entry.inode)
+                if entry.type != 'directory':
+                    continue
+                if (entry.mtime_ns, entry.inode) == (old.mtime_ns, old.inode):
+                    unchanged.append(child)
+                else:
+                    stack.append((child_path, child))
+
+    def _delete_tree(self, path, workers):
+        use_fd = ({os.open, os.unlink, os.rmdir} <= os.supports_dir_fd and os.scandir in os.supports_fd
+                  and hasattr(os, 'O_DIRECTORY') and hasattr(os, 'O_NOFOLLOW'))
+        counts, errors, lock = [0, 0], [], threading.Lock()
+
+        def record(index=None, failure=None):
+            with lock:
+                if failure is not None:
+                    errors.append(failure)
+                else:
+                    counts[index] += 1
+
+        if use_fd:
+            root_fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW)
+        elif os.path.islink(path):
+            raise OSError(errno.ELOOP, 'Cannot delete a symbolic link recursively', path)
+        else:
+            root_fd = None
+        root = _DeleteNode(None, None, path, root_fd)
+        try:
+            stack = self._delete_children(root, self._delete_entries(root_fd, path, record))
+            pending = set()
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                while stack or pending:
+                    while stack and len(pending) < workers * 2:
+                        pending.add(executor.submit(self._delete_node, stack.pop(), root, lock, record))
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stack.extend(future.result())
+        finally:
+            if root_fd is not None:
+                os.close(root_fd)
+        try:
+            os.rmdir(path)
+            record(1)
+        except OSError as e:
+            record(failure=(path, e))
+        return DeleteReport(counts[0], counts[1], errors)
+
+    def _delete_children(self, node, subdirs):
+        node.remaining = len(subdirs)
+        return [_DeleteNode(node, name, subdir_path) for name, subdir_path in subdirs]
+
+    def _delete_node(self, node, root, lock, record):
+        parent_fd = node.parent.fd
+        try:
+            if parent_fd is not None:
+                try:
+                    node.fd = os.open(node.name, os.O_RDONLY | os.O_DIRECTORY | os.O_NOFOLLOW, dir_fd=parent_fd)
+                except OSError as e:
+                    # out of descriptors: the subtree is deleted by path instead
+                    if e.errno not in (errno.EMFILE, errno.ENFILE):
+                        raise
+            subdirs = self._delete_entries(node.fd, node.path, record)
+        except OSError as e:
+            record(failure=(node.path, e))
+            self._delete_completed(node, root, lock, record, remove=False)
+            return []
+        if subdirs:
+            return self._delete_children(node, subdirs)
+        self._delete_completed(node, root, lock, record)
+        return []
+
+    def _delete_completed(self, node, root, lock, record, remove=True):
+        while node is not root:
+            if node.fd is not None:
+                os.close(node.fd)
+                node.fd = None
+            if remove:
+                try:
+                    if node.parent.fd is None:
+                        os.rmdir(node.path)
+                    else:
+                        os.rmdir(node.name, dir_fd=node.parent.fd)
+                    record(1)
+                except OSError as e:
+                    record(failure=(node.path, e))
+            node, remove = node.parent, True
+            with lock:
+                node.remaining -= 1
+                if node.remaining:
+                    return
+
+    def _delete_entries(self, fd, path, record):
+        subdirs = []
+        with os.scandir(path if fd is None else fd) as it:
+            entries = list(it)
+        for entry in entries:
+            entry_path = os.path.join(path, entry.name)
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                is_dir = False
+            if is_dir:
+                subdirs.append((entry.name, entry_path))
+                continue
+            try:
+                if fd is None:
+                    os.unlink(entry_path)
+                else:
+                    os.unlink(entry.name, dir_fd=fd)
+                record(0)
+            except OSError as e:
+                record(failure=(entry_path, e))
+        return subdirs
+
+    def _copy_tree(self, path, new_path, workers, preserve_times=False):
+        source_root, target_root = os.path.realpath(path), os.path.realpath(new_path)
+        if target_root == source_root or target_root.startswith(os.path.join(source_root, '')):
+            raise ValueError('Unable to copy directory: the destination is inside the source directory')
+        os.mkdir(new_path)
+        try:
+            return self._copy_tree_entries(path, new_path, workers, preserve_times)
+        except BaseException:
+            self._delete_tree(new_path, WORKERS)
+            raise
+
+    def _copy_tree_entries(self, path, new_path, workers, preserve_times):
+        files, directories = [], [(path, new_path)]
+        for source, target in directories:
+            with os.scandir(source) as it:
+                entries = list(it)
+            if target is not new_path:
+                os.mkdir(target)
+            for entry in entries:
+                entry_target = os.path.join(target, entry.name)
+                if entry.is_symlink():
+                    os.symlink(os.readlink(entry.path), entry_target)
+                elif entry.is_dir():
+                    directories.append((entry.path, entry_target))
+                else:
+                    files.append((entry.path, entry_target))
+        copy = lambda pair: self._copy_file(pair[0], pair[1], preserve_times)
+        copied = sum(self._imap_unordered(copy, files, workers))
+        for source, target in reversed(directories):
+            st = os.stat(source)
+            os.chmod(target, stat.S_IMODE(st.st_mode))
+            if preserve_times:
+                os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return copied
+
+    def _copy_file(self, path, new_path, preserve_times=False):
+        if os.path.islink(path):
+            os.symlink(os.readlink(path), new_path)
+            return 0
+        with open(path, 'rb', buffering=0) as source:
+            st = os.fstat(source.fileno())
+            try:
+                target_st = os.stat(new_path)
+            except FileNotFoundError:
+                target_st = None
+            if target_st is not None and (target_st.st_dev, target_st.st_ino) == (st.st_dev, st.st_ino):
+                raise ValueError('Unable to copy file: source and destination are the same file')
+            with open(new_path, 'wb', buffering=0) as target:
+                for offset, length in self._data_segments(source.fileno(), st.st_size):
+                    self._copy_range(source, target, offset, length)
+                os.ftruncate(target.fileno(), st.st_size)
+        os.chmod(new_path, stat.S_IMODE(st.st_mode))
+        if preserve_times:
+            os.utime(new_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return st.st_size
+
+    def _data_segments(self, fd, size):
+        if not (size and hasattr(os, 'SEEK_DATA')):
+            return [(0, size)]
+        segments, position = [], 0
+        try:
+            while position < size:
+                try:
+                    data = os.lseek(fd, position, os.SEEK_DATA)
+                except OSError as e:
+                    if e.errno == errno.ENXIO:
+                        break
+                    raise
+                position = min(os.lseek(fd, data, os.SEEK_HOLE), size)
+                segments.append((data, position - data))
+        except OSError:
+            return [(0, size)]
+        return segments
+
+    def _copy_range(self, source, target, offset, length):
+        end = offset + length
+        fallback_errors = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EBADF, errno.EOPNOTSUPP,
+                           getattr(errno, 'ENOTSUP', errno.EOPNOTSUPP), errno.EPERM)
+        if hasattr(os, 'copy_file_range'):
+            try:
+                while offset < end:
+                    copied = os.copy_file_range(source.fileno(), target.fileno(), end - offset, offset, offset)
+                    if not copied:
+                        return
+                    offset += copied
+                return
+            except OSError as e:
+                if e.errno not in fallback_errors:
+                    raise
+        if hasattr(os, 'sendfile') and sys.platform.startswith('linux'):
+            try:
+                target.seek(offset)
+                while offset < end:
+                    copied = os.sendfile(target.fileno(), source.fileno(), offset, min(end - offset, 1 << 30))
+                    if not copied:
+                        return
+                    offset += copied
+                return
+            except OSError as e:
+                if e.errno not in fallback_errors:
+                    raise
+        source.seek(offset)
+        target.seek(offset)
+        buffer = bytearray(min(CHUNK_SIZE, end - offset) or 1)
+        view = memoryview(buffer)
+        while offset < end:
+            size = source.readinto(view[:min(len(buffer), end - offset)])
+            if not size:
+                return
+            written = 0
+            while written < size:
+                written += target.write(view[written:size])
+            offset += size
+
+    def _bulk_handler(self, func, items, workers, op):
+        self._validate_params(workers, int, op)
+        if isinstance(items, (str, bytes)) or workers < 1:
+            raise ValueError(f'Unable to {op}: invalid parameter')
+
+        def run(item):
+            try:
+                return OperationResult(item, func(item), None)
+            except Exception as e:
+                return OperationResult(item, None, e)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run, items))
+
+    def _write_handler(self, path, op, data, atomic=False, durable=False):
+        if not (atomic or durable):
+            return self._op_handler(path, op, data)
+        if op != 'write':
+            self._flush_pending(path)
+        try:
+            with self._measure(op, path) as size, self._error_handler():
+                if size is not None:
+                    size[0] = self._op_size(op, data, None)
+                target = self._temp_path(path) if atomic else path
+                pending = getattr(self._group_commit, 'pending', None)
+                deferred = durable and pending is not None
+                try:
+                    self._write_file(target, 'x' if atomic else 'w', op, data, durable)
+                    if atomic:
+                        self._copy_mode(path, target)
+                except BaseException:
+                    if atomic:
+                        self._remove_quietly(target)
+                    raise
+                if deferred:
+                    pending.append((target if atomic else None, path))
+                    return
+                if atomic:
+                    os.replace(target, path)
+                if durable:
+                    self._fsync_directory(path)
+        finally:
+            self._path_changed(path)
+
+    def _line_ranges(self, path, chunk_size):
+        ranges, start = [], 0
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            while start < size:
+                f.seek(min(start + chunk_size, size) - 1)
+                f.readline()
+                ranges.append((start, f.tell()))
+                start = ranges[-1][1]
+        return ranges
+
+    def _concatenate(self, parts, path):
+        target = self._temp_path(path)
+        try:
+            with open(target, 'xb') as f:
+                for part in parts:
+                    with open(part, 'rb') as source:
+                        for block in iter(functools.partial(source.read, CHUNK_SIZE), b''):
+                            f.write(block)
+            self._copy_mode(path, target)
+            os.replace(target, path)
+        except BaseException:
+            self._remove_quietly(target)
+            raise
+        finally:
+            self._path_changed(path)
+
+    def _temp_path(self, path):
+        directory, base_name = os.path.split(path)
+        return os.path.join(directory, f'.tmp-{os.urandom(4).hex()}-{base_name}')
+
+    def _copy_mode(self, path, target):
+        try:
+            os.chmod(target, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+
+    def _remove_quietly(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _fsync_directory(self, path):
+        if os.name == 'nt':
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def _end_group_commit(self):
+        group = self._group_commit
+        group.depth -= 1
+        if group.depth:
+            return None
+        pending, group.pending = group.pending, None
+        return pending
+
+    def _discard_group_commit(self, pending):
+        for temp_path, _ in pending:
+            if temp_path is not None:
+                self._remove_quietly(temp_path)
+
+    def _commit_group_commit(self, pending, workers):
+        try:
+            with self._error_handler():
+                directories = {}
+                for temp_path, path in pending:
+                    if temp_path is not None:
+                        os.replace(temp_path, path)
+                        self._path_changed(path)
+                    directories.setdefault(os.path.dirname(os.path.abspath(path)), path)
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    list(executor.map(self._fsync_directory, directories.values()))
+        except BaseException:
+            self._discard_group_commit(pending)
+            raise
+
     def _op_handler(self, path, op='read', data=''):
+        if self._write_behind is not None and op != 'write':
+            pending = self._pending_op(path, op, data)
+            if pending is not None:
+                return pending[0]
         try:
+            with self._measure(op, path) as size:
+                result = self._run_op(path, op, data)
+                if size is not None:
+                    size[0] = self._op_size(op, data, result)
+                return result
+        finally:
+            if op in MUTATING_OPS:
+                self._path_changed(path, data if op == 'rename' else None, op in ('rename', 'rmdir'))
+
+    def _run_op(self, path, op, data):
+        with self._error_handler():
             if op == 'listdir':
                 return os.listdir(path)
             elif op == 'mkdir':
                 os.mkdir(path)
             elif op == 'rename':
-                os.rename(path, data)
+                self._rename(path, data)
             elif op in ('remove', 'rmdir'):
                 os.remove(path) if op == 'remove' else os.rmdir(path)
+            elif op == 'mmap':
+                with open(path, 'rb') as f:
+                    if not os.fstat(f.fileno()).st_size:
+                        return memoryview(b'')
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            elif op in ('write', 'append', 'writelines', 'writebytes', 'appendbytes'):
+                self._write_file(path, op[0], op, data)
             else:
-                mode = op[0]
-                with open(path, mode) as f:
-                    if op == 'read':
+                mode = 'r' + ('b' if op.endswith('bytes') or op == 'readinto' else '')
+                with self._open(path, mode) as f:
+                    if op in ('read', 'readbytes'):
                         return f.read()
-                    elif op in ('write', 'append'):
-                        f.write(data)
+                    elif op == 'readinto':
+                        return f.readinto(data)
                     elif op == 'readline':
                         return f.readline()
                     elif op == 'readlines':
                         return f.readlines()
-                    elif op == 'writelines':
-                        f.writelines(data)
+
+    def _codec(self, path):
+        if not self._compression:
+            return None
+        return COMPRESSION_CODECS.get(os.path.splitext(path)[1].lower())
+
+    def _open(self, path, mode):
+        codec = self._codec(path)
+        if codec is None:
+            return open(path, mode)
+        return codec.open(path, mode if 'b' in mode else mode + 't',
+                          None if mode[0] == 'r' else self._compression_level)
+
+    def _write_file(self, path, mode, op, data, durable=False):
+        codec = self._codec(path)
+        binary = op.endswith('bytes')
+        with open(path, mode + ('b' if binary or codec is not None else '')) as f:
+            if codec is None:
+                f.writelines(data) if op == 'writelines' else f.write(data)
+            else:
+                threshold = self._compression_threshold
+                size = sum(map(len, data)) if op == 'writelines' else len(data)
+                if threshold is not None and size >= threshold:
+                    self._compress_to(f, codec, ''.join(data) if op == 'writelines' else data)
+                else:
+                    with codec.open(f, mode + ('b' if binary else 't'), self._compression_level) as g:
+                        g.writelines(data) if op == 'writelines' else g.write(data)
+            if durable:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _compress_to(self, f, codec, data):
+        if isinstance(data, str):
+            if os.linesep != '\n':
+                data = data.replace('\n', os.linesep)
+            encoding = locale.getpreferredencoding(False)
+            blocks = (data[i:i + CHUNK_SIZE].encode(encoding) for i in range(0, len(data), CHUNK_SIZE))
+        else:
+            data = memoryview(data).cast('B')
+            blocks = (data[i:i + CHUNK_SIZE] for i in range(0, len(data), CHUNK_SIZE))
+        compressor = codec.compressor(self._compression_level)
+        compressed, stop, end = queue.Queue(maxsize=4), threading.Event(), object()
+
+        def compress():
+            try:
+                for block in blocks:
+                    if stop.is_set():
+                        return
+                    compressed.put(compressor.compress(block))
+                compressed.put(compressor.flush())
+            except BaseException as e:
+                compressed.put(e)
+            finally:
+                compressed.put(end)
+
+        worker = threading.Thread(target=compress, daemon=True)
+        worker.start()
+        try:
+            item = compressed.get()
+            while item is not end:
+                if isinstance(item, BaseException):
+                    raise item
+                f.write(item)
+                item = compressed.get()
+        finally:
+            stop.set()
+            while worker.is_alive():
+                try:
+                    compressed.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            worker.join()
+
+    def _pending_op(self, path, op, data):
+        key = os.path.abspath(path)
+        with self._lock:
+            pending = self._write_behind
+            entry = None if pending is None else pending.get(key)
+            if entry is not None and op == 'read':
+                return (entry[0],)
+            if entry is not None and op == 'append':
+                pending[key] = (entry[0] + data, entry[1])
+                self._write_behind_size += len(data)
+                full = self._pending_full()
+            elif entry is None and op not in ('rename', 'rmdir'):
+                return None
+        if entry is not None and op == 'append':
+            if full:
+                self._flush_pending()
+            return (None,)
+        self._flush_pending(path, tree=op in ('rename', 'rmdir'))
+        if op == 'rename':
+            self._flush_pending(data, tree=True)
+        return None
+
+    def _defer_write(self, path, content, atomic):
+        key = os.path.abspath(path)
+        with self._lock:
+            pending = self._write_behind
+            if pending is None:
+                return False
+            previous = pending.get(key)
+            pending[key] = (content, atomic)
+            self._write_behind_size += len(content) - (0 if previous is None else len(previous[0]))
+            full = self._pending_full()
+        if full:
+            self._flush_pending()
+        return True
+
+    def _discard_pending(self, path):
+        if not self._write_behind:
+            return
+        key = os.path.abspath(path)
+        with self._flush_lock, self._lock:
+            entry = self._write_behind.pop(key, None) if self._write_behind is not None else None
+            if entry is not None:
+                self._write_behind_size -= len(entry[0])
+
+    def _pending_full(self):
+        return self._write_behind_limit is not None and self._write_behind_size >= self._write_behind_limit
+
+    def _flush_pending(self, path=None, tree=False):
+        if not self._write_behind:
+            return
+        with self._flush_lock:
+            self._write_pending(path, tree)
+
+    def _write_pending(self, path=None, tree=False):
+        with self._lock:
+            pending = self._write_behind
+            if not pending:
+                return
+            if path is None:
+                items = list(pending.items())
+            elif tree:
+                key = os.path.abspath(path)
+                prefix = os.path.join(key, '')
+                items = [(k, entry) for k, entry in pending.items() if k == key or k.startswith(prefix)]
+            else:
+                key = os.path.abspath(path)
+                items = [(key, pending[key])] if key in pending else []
+        for key, entry in items:
+            self._write_handler(key, 'write', entry[0], atomic=entry[1])
+            with self._lock:
+                if pending.get(key) is entry:
+                    del pending[key]
+                    self._write_behind_size -= len(entry[0])
+
+    def _flush_periodically(self, interval, stop):
+        while not stop.wait(interval):
+            try:
+                self._flush_pending()
+            except (OSError, ValueError):
+                pass
+
+    def _op_size(self, op, data, result):
+        if op in ('write', 'append', 'writebytes', 'appendbytes'):
+            return len(data)
+        elif op == 'writelines':
+            return sum(map(len, data))
+        elif op == 'readlines':
+            return sum(map(len, result))
+        elif op == 'readinto':
+            return result or 0
+        elif isinstance(result, (str, bytes, mmap.mmap, memoryview)):
+            return len(result)
+        return 0
+
+    @contextmanager
+    def _measure(self, op, path):
+        if self._metrics is None:
+            yield None
+            return
+        size, error, start = [0], None, time.perf_counter()
+        try:
+            yield size
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record_metric(op, path, time.perf_counter() - start, size[0], error)
+
+    def _record_metric(self, op, path, elapsed, size, error):
+        with self._lock:
+            if self._metrics is None:
+                return
+            record = self._metrics.get(op)
+            if record is None:
+                record = self._metrics[op] = {'count': 0, 'errors': 0, 'bytes': 0, 'total_time': 0.0,
+                                              'max_time': 0.0, 'histogram': [0] * len(LATENCY_BUCKETS)}
+            record['count'] += 1
+            record['errors'] += error is not None
+            record['bytes'] += size
+            record['total_time'] += elapsed
+            record['max_time'] = max(record['max_time'], elapsed)
+            record['histogram'][next(i for i, bound in enumerate(LATENCY_BUCKETS) if elapsed <= bound)] += 1
+            hooks = self._metrics_hooks
+        for hook in hooks:
+            try:
+                hook(op, path, elapsed, size, error)
+            except Exception:
+                pass
+
+    def _stream_handler(self, path, op='chunks', data=None):
+        self._flush_pending(path)
+        with self._measure(op, path) as size, self._error_handler():
+            with self._open(path, 'r') as f:
+                if op == 'chunks':
+                    chunk = f.read(data)
+                    while chunk:
+                        if size is not None:
+                            size[0] += len(chunk)
+                        yield chunk
+                        chunk = f.read(data)
+                elif op == 'lines':
+                    for line in f:
+                        if size is not None:
+                            size[0] += len(line)
+                        yield line
+
+    @contextmanager
+    def _error_handler(self):
+        try:
+            yield
         except FileNotFoundError:
             raise FileNotFoundError('No such file or directory') from None
         except FileExistsError:
@@ -547,3 +3429,482 @@ class FileManager:
             raise ValueError('Unable to read file content') from None
         except Exception as e:
             raise ValueError(e) from None
+
+
+class FileAppender:
+    """ Appends content to files through a pool of open handles.
+
+    Instances are created with ``FileManager.open_appender``. Open files are kept in a
+    least recently used pool bounded by ``max_handles``; evicted files are flushed and
+    closed. Files are also flushed every ``flush_interval`` seconds, after ``flush_size``
+    characters, on ``flush()`` and on ``close()``.
+
+    Methods
+    -------
+    append(content, path):
+        Appends the provided content to a file.
+
+    flush():
+        Flushes all open files.
+
+    close():
+        Flushes and closes all open files.
+    """
+    def __init__(self, file_manager, max_handles=64, buffering=CHUNK_SIZE, flush_interval=None, flush_size=None):
+        file_manager._validate_params((max_handles, buffering), (int, int), 'open appender')
+        if not ((flush_interval is None or (isinstance(flush_interval, (int, float)) and flush_interval > 0))
+                and (flush_size is None or (isinstance(flush_size, int) and flush_size > 0))
+                and max_handles > 0 and buffering > 0):
+            raise ValueError('Unable to open appender: invalid parameter')
+        self._file_manager = file_manager
+        self._max_handles = max_handles
+        self._buffering = buffering
+        self._flush_size = flush_size
+        self._handles = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._flusher = None
+        if flush_interval is not None:
+            self._flusher = threading.Thread(target=self._flush_periodically, args=(flush_interval,), daemon=True)
+            self._flusher.start()
+
+    @property
+    def closed(self):
+        return self._closed.is_set()
+
+    def append(self, content, path=None):
+        """ Appends the provided content to a file.
+
+        Parameters
+        ----------
+        content: str
+            The content to append.
+
+        path: ``None`` (default) or str
+            Optional parameter, the path of the file.
+                ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'``
+        """
+        fm = self._file_manager
+        path = fm.path if path is None else path
+        fm._validate_params((content, path), (str, str), 'append content')
+        key = os.path.abspath(path)
+        with self._lock:
+            if self.closed:
+                raise ValueError('Unable to append content: appender is closed')
+            with fm._error_handler():
+                handle = self._handles.get(key)
+                if handle is None:
+                    handle = self._open(key)
+                else:
+                    self._handles.move_to_end(key)
+                handle[0].write(content)
+                handle[1] += len(content)
+                if self._flush_size is not None and handle[1] >= self._flush_size:
+                    handle[0].flush()
+                    handle[1] = 0
+
+    def flush(self):
+        """ Flushes all open files. """
+        with self._lock, self._file_manager._error_handler():
+            for handle in self._handles.values():
+                handle[0].flush()
+                handle[1] = 0
+
+    def close(self):
+        """ Flushes and closes all open files. """
+        with self._lock:
+            if self.closed:
+                return
+            self._closed.set()
+            handles, self._handles = list(self._handles.values()), OrderedDict()
+            with self._file_manager._error_handler():
+                errors = []
+                for f, _ in handles:
+                    try:
+                        f.close()
+                    except Exception as e:
+                        errors.append(e)
+                if errors:
+                    raise errors[0]
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _open(self, key):
+        while len(self._handles) >= self._max_handles:
+            self._handles.popitem(last=False)[1][0].close()
+        f = open(key, 'a', buffering=self._buffering)
+        self._file_manager._path_changed(key)
+        handle = self._handles[key] = [f, 0]
+        return handle
+
+    def _flush_periodically(self, interval):
+        while not self._closed.wait(interval):
+            try:
+                self.flush()
+            except OSError:
+                pass
+
+
+class FileIndex:
+    """ A SQLite index of the entries of a directory tree.
+
+    Instances are created with ``FileManager.enable_index``. Paths are stored relative to
+    the indexed directory, with indexes on extension, name, size and modification time.
+
+    Methods
+    -------
+    refresh(full):
+        Updates the index with the changes made to the directory tree.
+
+    query(extension, pattern, min_size, max_size, modified_after, modified_before, type):
+        Returns the paths of the indexed entries matching all given criteria.
+
+    close():
+        Closes the database.
+    """
+    _SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS entries (path TEXT PRIMARY KEY, name TEXT NOT NULL, '
+        'extension TEXT NOT NULL, type TEXT NOT NULL, size INTEGER NOT NULL, '
+        'mtime_ns INTEGER NOT NULL, inode INTEGER NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS entries_extension ON entries (extension, size)',
+        'CREATE INDEX IF NOT EXISTS entries_name ON entries (name)',
+        'CREATE INDEX IF NOT EXISTS entries_size ON entries (size)',
+        'CREATE INDEX IF NOT EXISTS entries_mtime ON entries (mtime_ns)',
+    )
+
+    def __init__(self, file_manager, database_path, path):
+        self._file_manager = file_manager
+        self._root = os.path.abspath(path)
+        self._lock = threading.RLock()
+        with file_manager._error_handler():
+            try:
+                self._connection = sqlite3.connect(database_path, check_same_thread=False)
+                with self._connection:
+                    for statement in self._SCHEMA:
+                        self._connection.execute(statement)
+            except sqlite3.Error as e:
+                raise OSError(e) from None
+
+    @property
+    def root(self):
+        return self._root
+
+    def refresh(self, full=False):
+        """ Updates the index with the changes made to the directory tree.
+
+        Subdirectories whose modification time is unchanged are not listed again (see
+        ``FileManager.take_snapshot``); their subdirectories are compared in turn and the
+        indexed files inside them are re-stat'ed, so files added deeper in the tree or
+        modified in place are still updated.
+
+        Parameters
+        ----------
+        full: ``False`` (default) or bool
+            Optional parameter, whether every directory is listed again.
+
+        Returns
+        -------
+        int
+            The number of added, updated or removed entries.
+        """
+        fm = self._file_manager
+        with self._lock:
+            previous = {row[0]: SnapshotEntry(*row[1:]) for row in self._execute(
+                'SELECT path, type, size, mtime_ns, inode FROM entries')}
+            if full:
+                snapshot = fm.take_snapshot(path=self._root)
+            else:
+                snapshot = fm.take_snapshot(previous, skip_unchanged=True, path=self._root)
+                skipped = [key for key, entry in snapshot.items() if entry.type != 'directory'
+                           and self._in_skipped_directory(key, snapshot, previous)]
+                with fm._error_handler():
+                    for key, entry in fm._imap_unordered(self._restat, skipped, WORKERS):
+                        if entry is None:
+                            del snapshot[key]
+                        else:
+                            snapshot[key] = entry
+            changed = [(key, entry) for key, entry in snapshot.items() if previous.get(key) != entry]
+            removed = [(key,) for key in previous if key not in snapshot]
+            with self._transaction():
+                self._connection.executemany('DELETE FROM entries WHERE path = ?', removed)
+                self._upsert(changed)
+            return len(changed) + len(removed)
+
+    def query(self, extension=None, pattern=None, min_size=None, max_size=None,
+              modified_after=None, modified_before=None, type='file'):
+        """ Returns the paths of the indexed entries matching all given criteria.
+
+        Parameters
+        ----------
+        extension: ``None`` (default) or str
+            Optional parameter, the file extension (as returned by ``get_file_extension``).
+                ex: ``'.csv'``
+
+        pattern: ``None`` (default) or str
+            Optional parameter, a case-sensitive glob pattern matched against the base name.
+                ex: ``'report_*'``
+
+        min_size: ``None`` (default) or int
+            Optional parameter, the minimum size in bytes.
+                ex: ``100 * 1024 ** 2``
+
+        max_size: ``None`` (default) or int
+            Optional parameter, the maximum size in bytes.
+
+        modified_after: ``None`` (default) or float
+            Optional parameter, the earliest modification time in seconds since the epoch.
+                ex: ``time.time() - 86400``
+
+        modified_before: ``None`` (default) or float
+            Optional parameter, the latest modification time in seconds since the epoch.
+
+        type: ``'file'`` (default), ``None`` or str
+            Optional parameter, the entry type (``'file'``, ``'directory'``, ``'symlink'``
+            or ``'other'``), or ``None`` for all types.
+
+        Returns
+        -------
+        list
+            The sorted absolute paths of the matching entries.
+        """
+        conditions, params = [], []
+        for column, operator, value in (
+                ('type', '=', type), ('extension', '=', extension), ('name', 'GLOB', pattern),
+                ('size', '>=', min_size), ('size', '<=', max_size),
+                ('mtime_ns', '>=', None if modified_after is None else int(modified_after * 1e9)),
+                ('mtime_ns', '<=', None if modified_before is None else int(modified_before * 1e9))):
+            if value is not None:
+                conditions.append(f'{column} {operator} ?')
+                params.append(value)
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+        with self._lock:
+            rows = self._execute(f'SELECT path FROM entries{where} ORDER BY path', params)
+        return [os.path.join(self._root, row[0]) for row in rows]
+
+    def close(self):
+        """ Closes the database. """
+        with self._lock:
+            self._connection.close()
+
+    def _relative(self, path):
+        path = os.path.abspath(path)
+        if path.startswith(os.path.join(self._root, '')):
+            return path[len(self._root) + len(os.sep):]
+        return None
+
+    def _sync(self, path, new_path=None, tree=False):
+        old_key = self._relative(path)
+        new_key = self._relative(new_path) if new_path else None
+        fm = self._file_manager
+        with self._lock, self._transaction():
+            if new_path is None:
+                new_key, new_path = old_key, path
+            elif old_key is not None and new_key is not None:
+                self._delete(new_key)
+                self._connection.execute(
+                    'UPDATE entries SET path = ? || substr(path, ?) WHERE path = ? OR substr(path, 1, ?) = ?',
+                    (new_key, len(old_key) + 1, old_key, len(old_key) + 1, old_key + os.sep))
+                old_key = None
+            if old_key is not None:
+                self._delete(old_key)
+            if new_key is None:
+                return
+            try:
+                st = os.lstat(new_path)
+            except OSError:
+                self._delete(new_key)
+                return
+            entry = fm._list_entry(new_path, st)
+            self._upsert([(new_key, SnapshotEntry(entry.type, entry.size, entry.mtime_ns, entry.inode))])
+            if tree and entry.type == 'directory':
+                snapshot = fm.take_snapshot(path=new_path)
+                self._upsert((os.path.join(new_key, key), value) for key, value in snapshot.items())
+
+    def _in_skipped_directory(self, key, snapshot, previous):
+        parent = os.path.dirname(key)
+        if not parent:
+            return False
+        old, new = previous.get(parent), snapshot[parent]
+        return old is not None and (old.mtime_ns, old.inode) == (new.mtime_ns, new.inode)
+
+    def _restat(self, key):
+        path = os.path.join(self._root, key)
+        try:
+            entry = self._file_manager._list_entry(path, os.lstat(path))
+        except FileNotFoundError:
+            return key, None
+        return key, SnapshotEntry(entry.type, entry.size, entry.mtime_ns, entry.inode)
+
+    def _delete(self, key):
+        self._connection.execute('DELETE FROM entries WHERE path = ? OR substr(path, 1, ?) = ?',
+                                 (key, len(key) + 1, key + os.sep))
+
+    def _upsert(self, items):
+        rows = ((key, os.path.basename(key), os.path.splitext(os.path.basename(key))[1], entry.type,
+                 entry.size, entry.mtime_ns, entry.inode) for key, entry in items)
+        self._connection.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+
+    def _execute(self, statement, params=()):
+        with self._file_manager._error_handler():
+            try:
+                return self._connection.execute(statement, params).fetchall()
+            except sqlite3.Error as e:
+                raise OSError(e) from None
+
+    @contextmanager
+    def _transaction(self):
+        with self._file_manager._error_handler():
+            try:
+                with self._connection:
+                    yield
+            except sqlite3.Error as e:
+                raise OSError(e) from None
+
+
+class AsyncFileManager:
+    """ An asyncio facade over ``FileManager`` with the same public methods as awaitables.
+
+    Every call is dispatched to a bounded thread pool, so file operations never block
+    the event loop. Calls accept the same parameters and raise the same exceptions as
+    ``FileManager``; methods returning iterables (e.g., ``iter_chunks``, ``walk_directory``
+    or ``list_directory_contents``) can also be consumed with ``async for``, which pulls
+    their items from the thread pool in batches of up to ``ASYNC_BATCH_SIZE`` items (or
+    ``CHUNK_SIZE`` bytes) per hop; ``follow_lines`` is pulled one line at a time.
+
+    ``group_commit`` is not available, since its pending commits are per thread and the
+    calls of one block may run on different threads of the pool. Attributes that are not
+    methods, such as ``index``, are not exposed either; use them through ``file_manager``.
+
+    Attributes
+    ----------
+    path: ``None`` (default) or str
+        Optional attribute, defines the global path used for all methods.
+            ex: ``'C:\\Users\\johndoe\\Documents\\file.txt'`` or ``'C:\\Users\\johndoe\\Documents'``
+
+    workers: ``WORKERS`` (default) or int
+        Optional attribute, the maximum number of file operations running at the same time.
+            ex: ``16``
+
+    file_manager: ``None`` (default) or FileManager
+        Optional attribute, an existing instance to dispatch to instead of creating one.
+
+    Examples
+    --------
+    ``content = await async_file_manager.read_content(path)``
+
+    ``async for line in async_file_manager.iter_lines(path): ...``
+    """
+    _UNSUPPORTED = frozenset(('group_commit',))
+    _UNBATCHED = frozenset(('follow_lines',))
+
+    def __init__(self, path=None, workers=WORKERS, file_manager=None):
+        if file_manager is None:
+            file_manager = FileManager(path)
+        elif not isinstance(file_manager, FileManager):
+            raise ValueError('Invalid file_manager attribute')
+        elif path is not None:
+            file_manager.path = path
+        if not (isinstance(workers, int) and workers > 0):
+            raise ValueError('Invalid workers attribute')
+        self._file_manager = file_manager
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    @property
+    def path(self):
+        return self._file_manager.path
+
+    @path.setter
+    def path(self, value):
+        self._file_manager.path = value
+
+    @property
+    def file_manager(self):
+        return self._file_manager
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name in self._UNSUPPORTED:
+            raise AttributeError(name)
+        attr = getattr(self._file_manager, name)
+        if not callable(attr):
+            raise AttributeError(name)
+        batch_size = 1 if name in self._UNBATCHED else ASYNC_BATCH_SIZE
+
+        @functools.wraps(attr)
+        def method(*args, **kwargs):
+            return _AsyncCall(self._executor, functools.partial(attr, *args, **kwargs), batch_size)
+        return method
+
+    def __dir__(self):
+        names = set(super().__dir__())
+        names.update(name for name in dir(self._file_manager) if not name.startswith('_')
+                     and name not in self._UNSUPPORTED and callable(getattr(self._file_manager, name)))
+        return sorted(names)
+
+    async def close(self):
+        """ Waits for running operations and shuts down the thread pool. """
+        await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+class _DeleteNode:
+    __slots__ = ('parent', 'name', 'path', 'fd', 'remaining')
+
+    def __init__(self, parent, name, path, fd=None):
+        self.parent = parent
+        self.name = name
+        self.path = path
+        self.fd = fd
+        self.remaining = 0
+
+
+class _AsyncCall:
+    """ A pending ``FileManager`` call that can be awaited or iterated with ``async for``. """
+
+    def __init__(self, executor, func, batch_size=ASYNC_BATCH_SIZE):
+        self._executor = executor
+        self._func = func
+        self._batch_size = batch_size
+
+    def __await__(self):
+        return self._run(self._func).__await__()
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _iterate(self):
+        iterator = iter(await self._run(self._func))
+        try:
+            while True:
+                batch = await self._run(self._next_batch, iterator)
+                if not batch:
+                    break
+                for item in batch:
+                    yield item
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                await self._run(close)
+
+    def _next_batch(self, iterator):
+        batch, size = [], 0
+        for item in iterator:
+            batch.append(item)
+            if isinstance(item, (str,) + BYTES_TYPES):
+                size += len(item)
+            if len(batch) >= self._batch_size or size >= CHUNK_SIZE:
+                break
+        return batch
@@ -1,11 +1,33 @@
+import asyncio
+import bz2
+import errno
+import gzip
+import hashlib
+import json
+import locale
 import logging
+import lzma
+import os
+import tempfile
+import threading
+import time
 import unittest
-from filemanager import FileManager
+from unittest import mock
+from filemanager import ASYNC_BATCH_SIZE, CHUNK_SIZE, AsyncFileManager, FileManager, _AsyncCall
+
 
 logging.basicConfig(level=logging.INFO, filename='filemanager_unittest.log', filemode='w', 
                     format='%(asctime)s - %(levelname)s - %(message)s')
 
 
+def count_lines(lines):
+    return sum(1 for _ in lines)
+
+
+def upper_lines(lines):
+    return (line.upper() for line in lines if not line.startswith('skip'))
+
+
 class TestFileManager(unittest.TestCase):
 
     @classmethod
@@ -175,5 +197,1038 @@ class TestFileManager(unittest.TestCase):
         self.assertTrue(self.fm.is_directory(temp_dir))
         self.fm.path = self.fm.path_join(self.cwd, temp_dir)
 
+
+class TempDirTestCase(unittest.TestCase):
+    """ Base class for tests that run against a throwaway directory tree. """
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = self._temp_dir.name
+        self.fm = FileManager(self.root)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    # --- Helper Methods ---
+
+    def _write_file(self, name, content='', mode='w'):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, mode) as f:
+            f.write(content)
+        return path
+
+
+class TestStreamingMethods(TempDirTestCase):
+
+    def test_iter_chunks(self):
+        path = self._write_file('file1.txt', 'abcdefghij')
+        chunks = list(self.fm.iter_chunks(4, path))
+        self.assertEqual(chunks, ['abcd', 'efgh', 'ij'])
+        with self.assertRaises(ValueError):
+            self.fm.iter_chunks(0, path)
+
+    def test_iter_lines(self):
+        path = self._write_file('file1.txt', 'test1\ntest2\ntest3')
+        self.assertEqual(list(self.fm.iter_lines(path)), ['test1\n', 'test2\n', 'test3'])
+        with self.assertRaises(FileNotFoundError):
+            next(self.fm.iter_lines(os.path.join(self.root, 'missing.txt')))
+
+    def test_map_content(self):
+        path = self._write_file('file1.bin', b'header:payload', 'wb')
+        with self.fm.map_content(path) as mapped:
+            self.assertEqual(mapped.find(b':'), 6)
+            self.assertEqual(bytes(memoryview(mapped)[7:]), b'payload')
+        empty = self._write_file('file2.bin', b'', 'wb')
+        with self.fm.map_content(empty) as mapped:
+            self.assertEqual(len(mapped), 0)
+
+
+class TestProcessLines(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.lines = [f'skip {i}\n' if i % 3 == 0 else f'line {i}\n' for i in range(1000)]
+        self.path = self._write_file('file1.txt', ''.join(self.lines))
+
+    def test_process_lines(self):
+        results = self.fm.process_lines(count_lines, workers=2, chunk_size=1000, path=self.path)
+        self.assertGreater(len(results), 5)
+        self.assertEqual(sum(results), 1000)
+        self.assertEqual(self.fm.process_lines(count_lines, merge=sum, workers=1, chunk_size=1, path=self.path), 1000)
+        self.assertEqual(self.fm.process_lines(count_lines, path=self.path), [1000])
+
+    def test_process_lines_output(self):
+        output_path = os.path.join(self.root, 'output.txt')
+        self.assertIsNone(self.fm.process_lines(upper_lines, output_path=output_path, workers=2, chunk_size=500,
+                                                path=self.path))
+        self.assertEqual(self.fm.read_all_lines(output_path),
+                         [line.upper() for line in self.lines if not line.startswith('skip')])
+        self.assertEqual(sorted(os.listdir(self.root)), ['file1.txt', 'output.txt'])
+        with self.assertRaises(ValueError):
+            self.fm.process_lines(None, path=self.path)
+        with self.assertRaises(FileNotFoundError):
+            self.fm.process_lines(count_lines, path=os.path.join(self.root, 'missing.txt'))
+
+
+class TestBinaryMethods(TempDirTestCase):
+
+    def test_binary_content_methods(self):
+        path = os.path.join(self.root, 'file1.bin')
+
+        # write_bytes
+        self.fm.write_bytes(b'\x00\x01', path)
+        self.assertEqual(self.fm.read_bytes(path), b'\x00\x01')
+
+        # append_bytes
+        self.fm.append_bytes(memoryview(b'\x02\x03'), path)
+        self.assertEqual(self.fm.read_bytes(path), b'\x00\x01\x02\x03')
+
+        # read_into
+        buffer = bytearray(3)
+        self.assertEqual(self.fm.read_into(buffer, path), 3)
+        self.assertEqual(buffer, b'\x00\x01\x02')
+
+        with self.assertRaises(ValueError):
+            self.fm.write_bytes('text', path)
+
+
+class TestPathBatchMethods(TempDirTestCase):
+
+    def test_path_batch_methods(self):
+        paths = [os.path.join(self.root, 'file1.txt'), os.path.join(self.root, 'folder1', 'file2.csv'),
+                 os.path.join(self.root, 'file3.txt'), os.path.join(self.root, 'folder1')]
+        self.assertEqual(self.fm.get_parent_directories(paths), [self.fm.get_parent_directory(p) for p in paths])
+        self.assertEqual(self.fm.get_base_names(iter(paths)), [self.fm.get_base_name(p) for p in paths])
+        self.assertEqual(self.fm.get_file_extensions(paths), ['.txt', '.csv', '.txt', ''])
+        columns = self.fm.split_paths(paths)
+        self.assertEqual(columns.base_names, ['file1.txt', 'file2.csv', 'file3.txt', 'folder1'])
+        self.assertEqual(columns.extensions, ['.txt', '.csv', '.txt', ''])
+        self.assertEqual(self.fm.group_paths(paths), {'.txt': [paths[0], paths[2]], '.csv': [paths[1]], '': [paths[3]]})
+        self.assertEqual(self.fm.group_paths(paths, key='parent'),
+                         {self.root: [paths[0], paths[2], paths[3]], paths[3]: [paths[1]]})
+        self.assertEqual(self.fm.path_join_many(self.root, ['folder1', 'folder2'], ('file1.txt', 'file2.txt')),
+                         [os.path.join(self.root, 'folder1', 'file1.txt'), os.path.join(self.root, 'folder2', 'file2.txt')])
+        self.assertEqual(self.fm.get_base_names([]), [])
+
+        for args in (('C:\\file.txt',), (['file.txt', ''],), (['file.txt', None],), (123,)):
+            with self.assertRaises(ValueError):
+                self.fm.get_base_names(*args)
+        with self.assertRaises(ValueError):
+            self.fm.path_join_many(self.root, ['file1.txt'], ['file1.txt', 'file2.txt'])
+        with self.assertRaises(ValueError):
+            self.fm.group_paths(paths, key='size')
+
+
+class TestWalkDirectory(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._write_file('file1.txt', 'test1')
+        self._write_file(os.path.join('folder1', 'file2.csv'), 'a,b')
+        self._write_file(os.path.join('folder1', 'folder2', 'file3.txt'), 'test3')
+
+    def test_walk_directory(self):
+        entries = {entry.name: entry for entry in self.fm.walk_directory()}
+        self.assertEqual(set(entries), {'file1.txt', 'folder1', 'file2.csv', 'folder2', 'file3.txt'})
+        self.assertEqual(entries['file1.txt'].type, 'file')
+        self.assertEqual(entries['file1.txt'].size, 5)
+        self.assertEqual(entries['folder2'].type, 'directory')
+
+    def test_walk_directory_filters(self):
+        names = [entry.name for entry in self.fm.walk_directory(extensions='.txt')]
+        self.assertEqual(sorted(names), ['file1.txt', 'file3.txt'])
+        names = [entry.name for entry in self.fm.walk_directory(max_depth=0)]
+        self.assertEqual(sorted(names), ['file1.txt', 'folder1'])
+        with self.assertRaises(ValueError):
+            self.fm.walk_directory(max_depth=-1)
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'requires symlink support')
+    def test_walk_directory_symlinks(self):
+        os.symlink(self.root, os.path.join(self.root, 'folder1', 'loop'))
+        entries = {entry.name: entry for entry in self.fm.walk_directory()}
+        self.assertEqual(entries['loop'].type, 'symlink')
+        names = [entry.name for entry in self.fm.walk_directory(follow_symlinks=True)]
+        self.assertEqual(names.count('file1.txt'), 1)
+
+    def test_walk_directory_errors(self):
+        list_entries = FileManager._list_entries
+
+        def deny_folder2(fm, directory, follow_symlinks=False):
+            if os.path.basename(directory) == 'folder2':
+                raise PermissionError(errno.EACCES, 'Permission denied', directory)
+            return list_entries(fm, directory, follow_symlinks)
+
+        errors = []
+        with mock.patch.object(FileManager, '_list_entries', deny_folder2):
+            names = [entry.name for entry in self.fm.walk_directory(onerror=errors.append)]
+            self.assertEqual(sorted(names), ['file1.txt', 'file2.csv', 'folder1', 'folder2'])
+            self.assertIsInstance(errors[0], PermissionError)
+            with self.assertRaises(PermissionError):
+                list(self.fm.walk_directory(path=os.path.join(self.root, 'folder1', 'folder2')))
+        with self.assertRaises(ValueError):
+            self.fm.walk_directory(onerror='ignore')
+
+
+class TestScanDirectory(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(8):
+            self._write_file(os.path.join(f'folder{i}', f'file{i}.txt'), 'test')
+            self._write_file(os.path.join(f'folder{i}', 'sub', f'file{i}.csv'), 'a,b')
+
+    def test_scan_directory(self):
+        walked = [entry.path for entry in self.fm.walk_directory()]
+        scanned = [entry.path for entry in self.fm.scan_directory(workers=4)]
+        self.assertEqual(sorted(scanned), sorted(walked))
+        ordered = [entry.path for entry in self.fm.scan_directory(workers=4, ordered=True)]
+        self.assertEqual(ordered, walked)
+        csv_files = list(self.fm.scan_directory(extensions='.csv', max_depth=1))
+        self.assertEqual(len(csv_files), 0)
+
+    def test_scan_directory_with_delay(self):
+        delay = 0.05
+        list_entries = FileManager._list_entries
+
+        def slow_list_entries(fm, directory, follow_symlinks=False):
+            time.sleep(delay)
+            return list_entries(fm, directory, follow_symlinks)
+
+        with mock.patch.object(FileManager, '_list_entries', slow_list_entries):
+            start = time.perf_counter()
+            entries = list(self.fm.scan_directory(workers=8))
+            elapsed = time.perf_counter() - start
+        # 17 directories listed sequentially would take at least 17 * delay
+        self.assertEqual(len(entries), 32)
+        self.assertLess(elapsed, 17 * delay * 0.6)
+
+    def test_scan_directory_errors(self):
+        list_entries = FileManager._list_entries
+
+        def deny_sub(fm, directory, follow_symlinks=False):
+            if os.path.basename(directory) == 'sub':
+                raise PermissionError(errno.EACCES, 'Permission denied', directory)
+            return list_entries(fm, directory, follow_symlinks)
+
+        errors = []
+        with mock.patch.object(FileManager, '_list_entries', deny_sub):
+            for ordered in (False, True):
+                entries = list(self.fm.scan_directory(workers=4, ordered=ordered, extensions='.txt'))
+                self.assertEqual(len(entries), 8)
+            list(self.fm.scan_directory(workers=4, onerror=errors.append))
+        self.assertEqual(len(errors), 8)
+
+
+class TestSnapshotMethods(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._write_file('file1.txt', 'test1')
+        self._write_file(os.path.join('folder1', 'file2.txt'), 'test2')
+        self._write_file(os.path.join('folder2', 'file3.txt'), 'test3')
+
+    def test_snapshot_diff(self):
+        old = self.fm.take_snapshot()
+        self.assertEqual(old['file1.txt'].size, 5)
+        self.assertEqual(old['folder1'].type, 'directory')
+
+        self._write_file('file4.txt', 'test4')
+        self.fm.delete_file(os.path.join(self.root, 'file1.txt'))
+        self.fm.rename_file(os.path.join(self.root, 'folder2', 'file5.txt'),
+                            os.path.join(self.root, 'folder2', 'file3.txt'))
+        path = os.path.join(self.root, 'folder1', 'file2.txt')
+        self.fm.write_content('modified', path)
+        new = self.fm.take_snapshot()
+
+        diff = self.fm.diff_snapshots(old, new)
+        self.assertEqual(diff.added, ['file4.txt'])
+        self.assertEqual(diff.removed, ['file1.txt'])
+        self.assertEqual(diff.modified, [os.path.join('folder1', 'file2.txt')])
+        self.assertEqual(diff.renamed, [(os.path.join('folder2', 'file3.txt'), os.path.join('folder2', 'file5.txt'))])
+
+    def test_snapshot_file(self):
+        snapshot = self.fm.take_snapshot()
+        snapshot_path = os.path.join(self.root, 'tree.snapshot')
+        self.fm.save_snapshot(snapshot, snapshot_path)
+        self.assertEqual(self.fm.load_snapshot(snapshot_path), snapshot)
+        self.fm.write_bytes(b'invalid', snapshot_path)
+        with self.assertRaises(ValueError):
+            self.fm.load_snapshot(snapshot_path)
+
+    def test_snapshot_skip_unchanged(self):
+        previous = self.fm.take_snapshot()
+        self._write_file(os.path.join('folder2', 'file4.txt'), 'test4')
+        list_entries = FileManager._list_entries
+        listed = []
+
+        def record_list_entries(fm, directory, follow_symlinks=False):
+            listed.append(os.path.basename(directory))
+            return list_entries(fm, directory, follow_symlinks)
+
+        with mock.patch.object(FileManager, '_list_entries', record_list_entries):
+            snapshot = self.fm.take_snapshot(previous, skip_unchanged=True)
+        self.assertNotIn('folder1', listed)
+        self.assertIn(os.path.join('folder1', 'file2.txt'), snapshot)
+        self.assertIn(os.path.join('folder2', 'file4.txt'), snapshot)
+
+    def test_snapshot_skip_unchanged_nested(self):
+        self._write_file(os.path.join('folder1', 'sub1', 'sub2', 'file4.txt'), 'test4')
+        previous = self.fm.take_snapshot()
+        self._write_file(os.path.join('folder1', 'sub1', 'sub2', 'file5.txt'), 'test5')
+        self._write_file(os.path.join('folder1', 'sub1', 'file6.txt'), 'test6')
+        snapshot = self.fm.take_snapshot(previous, skip_unchanged=True)
+        self.assertEqual(snapshot, self.fm.take_snapshot())
+        diff = self.fm.diff_snapshots(previous, snapshot)
+        self.assertEqual(diff.added, [os.path.join('folder1', 'sub1', 'file6.txt'),
+                                      os.path.join('folder1', 'sub1', 'sub2', 'file5.txt')])
+
+
+class TestSearchContent(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._write_file('file1.log', 'INFO start\nERROR disk full\nINFO retry\nERROR disk full\n')
+        self._write_file(os.path.join('folder1', 'file2.log'), 'WARN [slow]\n')
+        self._write_file(os.path.join('folder1', 'file3.txt'), 'ERROR ignored\n')
+        self._write_file('empty.log')
+
+    def test_search_content(self):
+        matches = sorted(self.fm.search_content('ERROR|WARN', extensions='.log', workers=2))
+        self.assertEqual([(os.path.basename(m.path), m.line_number, m.line) for m in matches], [
+            ('file1.log', 1, 'ERROR disk full'),
+            ('file1.log', 3, 'ERROR disk full'),
+            ('file2.log', 0, 'WARN [slow]'),
+        ])
+
+    def test_search_content_options(self):
+        matches = list(self.fm.search_content('[slow]', literal=True))
+        self.assertEqual([m.line for m in matches], ['WARN [slow]'])
+        matches = list(self.fm.search_content('^ERROR', first_match_only=True))
+        self.assertEqual(len(matches), 2)
+        with self.assertRaises(ValueError):
+            self.fm.search_content('(')
+
+    def test_search_content_errors(self):
+        search_file = FileManager._search_file
+
+        def delete_file1(fm, path, *args, **kwargs):
+            if os.path.basename(path) == 'file1.log':
+                os.remove(path)
+            return search_file(fm, path, *args, **kwargs)
+
+        errors = []
+        with mock.patch.object(FileManager, '_search_file', delete_file1):
+            matches = list(self.fm.search_content('ERROR|WARN', extensions='.log', workers=2,
+                                                  onerror=errors.append))
+        self.assertEqual([m.line for m in matches], ['WARN [slow]'])
+        self.assertIsInstance(errors[0], FileNotFoundError)
+
+
+class TestStatCache(TempDirTestCase):
+
+    def test_stat_cache(self):
+        path = os.path.join(self.root, 'file1.txt')
+        self.fm.enable_stat_cache(ttl=60, max_size=2)
+        self.assertFalse(self.fm.is_file(path))
+        self.assertFalse(self.fm.path_exists(path))
+        info = self.fm.stat_cache_info()
+        self.assertEqual((info['hits'], info['misses']), (1, 1))
+
+        # mutating operations invalidate the cached result
+        self.fm.create_file(path)
+        self.assertTrue(self.fm.is_file(path))
+        self.fm.rename_file(os.path.join(self.root, 'file2.txt'), path)
+        self.assertFalse(self.fm.path_exists(path))
+
+        # least recently used entries are evicted
+        self.fm.is_directory(self.root)
+        self.fm.is_file(os.path.join(self.root, 'file2.txt'))
+        self.assertEqual(self.fm.stat_cache_info()['size'], 2)
+
+        self.fm.disable_stat_cache()
+        self.assertFalse(self.fm.stat_cache_info()['enabled'])
+
+    def test_stat_cache_ttl(self):
+        path = self._write_file('file1.txt')
+        self.fm.enable_stat_cache(ttl=0.01)
+        self.assertTrue(self.fm.is_file(path))
+        os.remove(path)
+        time.sleep(0.02)
+        self.assertFalse(self.fm.is_file(path))
+
+
+class TestBulkFileOperations(TempDirTestCase):
+
+    def test_bulk_file_operations(self):
+        paths = [os.path.join(self.root, f'file{i}.txt') for i in range(20)]
+        missing = os.path.join(self.root, 'missing', 'file.txt')
+
+        # create_files
+        report = self.fm.create_files(paths + [missing], workers=4)
+        self.assertEqual([result.item for result in report], paths + [missing])
+        self.assertTrue(all(result.error is None for result in report[:-1]))
+        self.assertIsInstance(report[-1].error, FileNotFoundError)
+
+        # rename_files
+        pairs = [(path, path + '.bak') for path in paths]
+        report = self.fm.rename_files(pairs, workers=4)
+        self.assertTrue(all(result.error is None for result in report))
+        self.assertTrue(self.fm.is_file(paths[0] + '.bak'))
+
+        # delete_files
+        report = self.fm.delete_files([path + '.bak' for path in paths] + [paths[0]])
+        self.assertEqual(sum(result.error is None for result in report), 20)
+        self.assertEqual(os.listdir(self.root), [])
+
+        with self.assertRaises(ValueError):
+            self.fm.delete_files(paths[0])
+
+
+class TestCopyMethods(TempDirTestCase):
+
+    def test_copy_file(self):
+        path = self._write_file('file1.txt', 'test1\n' * 1000)
+        os.chmod(path, 0o640)
+        new_path = os.path.join(self.root, 'file2.txt')
+        self.fm.copy_file(new_path, path)
+        self.assertEqual(self.fm.read_content(new_path), 'test1\n' * 1000)
+        self.assertEqual(os.stat(new_path).st_mode & 0o777, 0o640)
+        with self.assertRaises(ValueError):
+            self.fm.copy_file(path, path)
+        with self.assertRaises(FileNotFoundError):
+            self.fm.copy_file(new_path, os.path.join(self.root, 'missing.txt'))
+
+    def test_copy_sparse_file(self):
+        path = os.path.join(self.root, 'sparse.bin')
+        with open(path, 'wb') as f:
+            f.write(b'head')
+            f.seek(4 * CHUNK_SIZE)
+            f.write(b'tail')
+            f.truncate(8 * CHUNK_SIZE)
+        new_path = os.path.join(self.root, 'copy.bin')
+        self.fm.copy_file(new_path, path)
+        self.assertEqual(os.path.getsize(new_path), 8 * CHUNK_SIZE)
+        self.assertEqual(self.fm.read_bytes(new_path), self.fm.read_bytes(path))
+
+    def test_copy_fallbacks(self):
+        path = self._write_file('file1.bin', b'x' * 100000, 'wb')
+        unsupported = OSError(errno.ENOSYS, 'not supported')
+        with mock.patch('os.copy_file_range', side_effect=unsupported, create=True), \
+                mock.patch('os.sendfile', side_effect=unsupported, create=True):
+            self.fm.copy_file(os.path.join(self.root, 'file2.bin'), path)
+        self.assertEqual(self.fm.read_bytes(os.path.join(self.root, 'file2.bin')), b'x' * 100000)
+
+    def test_copy_directory(self):
+        self._write_file(os.path.join('folder1', 'file1.txt'), 'test1')
+        self._write_file(os.path.join('folder1', 'folder2', 'file2.txt'), 'test2')
+        path = os.path.join(self.root, 'folder1')
+        new_path = os.path.join(self.root, 'folder3')
+        self.fm.copy_directory(new_path, workers=2, path=path)
+        self.assertEqual(self.fm.read_content(os.path.join(new_path, 'folder2', 'file2.txt')), 'test2')
+        with self.assertRaises(FileExistsError):
+            self.fm.copy_directory(new_path, path=path)
+        self.assertEqual(self.fm.read_content(os.path.join(new_path, 'file1.txt')), 'test1')
+
+        # destinations inside the source are rejected, and partial copies are removed
+        with self.assertRaises(ValueError):
+            self.fm.copy_directory(os.path.join(path, 'inner'), path=path)
+        self.assertEqual(sorted(os.listdir(path)), ['file1.txt', 'folder2'])
+        with mock.patch.object(self.fm, '_copy_file', side_effect=OSError(errno.EIO, 'I/O error')):
+            with self.assertRaises(OSError):
+                self.fm.copy_directory(os.path.join(self.root, 'folder4'), path=path)
+        self.assertFalse(self.fm.path_exists(os.path.join(self.root, 'folder4')))
+
+    def test_move_across_devices(self):
+        rename = os.rename
+
+        def cross_device_rename(path, new_path):
+            raise OSError(errno.EXDEV, 'Invalid cross-device link')
+
+        path = self._write_file('file1.txt', 'test1')
+        folder = os.path.dirname(self._write_file(os.path.join('folder1', 'file2.txt'), 'test2'))
+        with mock.patch('os.rename', cross_device_rename):
+            self.fm.move(os.path.join(self.root, 'file3.txt'), path)
+            self.fm.rename_directory(os.path.join(self.root, 'folder2'), folder)
+        self.assertFalse(self.fm.path_exists(path))
+        self.assertEqual(self.fm.read_content(os.path.join(self.root, 'file3.txt')), 'test1')
+        self.assertFalse(self.fm.path_exists(folder))
+        self.assertEqual(self.fm.read_content(os.path.join(self.root, 'folder2', 'file2.txt')), 'test2')
+        self.assertIs(os.rename, rename)
+
+
+class TestRecursiveDelete(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        for i in range(3):
+            for j in range(3):
+                self._write_file(os.path.join('folder1', f'folder{i}', f'folder{j}', f'file{j}.txt'), 'test')
+            self._write_file(os.path.join('folder1', f'file{i}.txt'), 'test')
+        self.path = os.path.join(self.root, 'folder1')
+
+    def test_delete_directory_recursive(self):
+        with self.assertRaises(OSError):
+            self.fm.delete_directory(self.path)
+        report = self.fm.delete_directory(self.path, recursive=True, workers=2)
+        self.assertEqual(report, (12, 13, []))
+        self.assertFalse(self.fm.path_exists(self.path))
+
+    @unittest.skipUnless(hasattr(os, 'symlink'), 'requires symlink support')
+    def test_delete_directory_recursive_symlinks(self):
+        outside = self._write_file(os.path.join('outside', 'keep.txt'), 'keep')
+        os.symlink(os.path.dirname(outside), os.path.join(self.path, 'link'))
+        report = self.fm.delete_directory(self.path, recursive=True)
+        self.assertEqual(report.errors, [])
+        self.assertTrue(self.fm.is_file(outside))
+
+    def test_delete_directory_recursive_deep(self):
+        path = leaf = os.path.join(self.root, 'deep')
+        os.mkdir(path)
+        for _ in range(1200):
+            leaf = os.path.join(leaf, 'd')
+            os.mkdir(leaf)
+        with open(os.path.join(leaf, 'file.txt'), 'w'):
+            pass
+        report = self.fm.delete_directory(path, recursive=True, workers=4)
+        self.assertEqual(report, (1, 1201, []))
+        self.assertFalse(self.fm.path_exists(path))
+
+    def test_delete_directory_recursive_path_fallback(self):
+        with mock.patch('os.supports_dir_fd', set()):
+            report = self.fm.delete_directory(self.path, recursive=True, workers=2)
+        self.assertEqual(report, (12, 13, []))
+
+
+class TestDiskUsage(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._write_file('file1.txt', 'a' * 10)
+        self._write_file(os.path.join('folder1', 'file2.txt'), 'a' * 100)
+        self._write_file(os.path.join('folder1', 'folder2', 'file3.txt'), 'a' * 1000)
+        self.folder1 = os.path.join(self.root, 'folder1')
+        self.folder2 = os.path.join(self.folder1, 'folder2')
+
+    def test_disk_usage(self):
+        usage = self.fm.disk_usage(workers=2)
+        self.assertEqual(list(usage), [self.root, self.folder1, self.folder2])
+        self.assertEqual(usage[self.root][::2], (1110, 3))
+        self.assertEqual(usage[self.root].directories, 2)
+        self.assertEqual(usage[self.folder1][::2], (1100, 2))
+        self.assertEqual(usage[self.folder2], (1000, usage[self.folder2].allocated_size, 1, 0))
+        self.assertEqual([p for p, _ in self.fm.largest_directories(count=2)], [self.root, self.folder1])
+
+    def test_disk_usage_cache(self):
+        self.fm.disk_usage()
+        with mock.patch('filemanager.os.scandir', wraps=os.scandir) as scandir:
+            self.assertEqual(self.fm.disk_usage()[self.root].apparent_size, 1110)
+            self.assertEqual(scandir.call_count, 0)
+            self._write_file(os.path.join('folder1', 'folder2', 'file4.txt'), 'b' * 5)
+            self.assertEqual(self.fm.disk_usage()[self.root].apparent_size, 1115)
+            self.assertEqual(scandir.call_count, 1)
+            self.fm.write_content('c', os.path.join(self.folder1, 'file2.txt'))
+            self.assertEqual(self.fm.disk_usage()[self.folder1].apparent_size, 1006)
+            self.assertEqual(scandir.call_count, 2)
+
+        # files modified in place by other programs are only seen without the cache
+        with open(os.path.join(self.folder2, 'file3.txt'), 'a') as f:
+            f.write('d' * 5000)
+        self.assertEqual(self.fm.disk_usage()[self.root].apparent_size, 1016)
+        self.assertEqual(self.fm.disk_usage(use_cache=False)[self.root].apparent_size, 6016)
+        self.assertEqual(self.fm.disk_usage()[self.root].apparent_size, 6016)
+        with self.assertRaises(FileNotFoundError):
+            self.fm.disk_usage(path=os.path.join(self.root, 'missing'))
+
+
+class TestHashMethods(TempDirTestCase):
+
+    def test_hash_file(self):
+        path = self._write_file('file1.txt', 'test1')
+        self.assertEqual(self.fm.hash_file(path=path), hashlib.sha256(b'test1').hexdigest())
+        self.assertEqual(self.fm.hash_file('md5', path), hashlib.md5(b'test1').hexdigest())
+        with self.assertRaises(ValueError):
+            self.fm.hash_file('unknown', path)
+
+        # cached checksums are reused until the file changes
+        with mock.patch('hashlib.new') as new:
+            self.fm.hash_file(path=path)
+            new.assert_not_called()
+        self.fm.write_content('test2', path)
+        self.assertEqual(self.fm.hash_file(path=path), hashlib.sha256(b'test2').hexdigest())
+
+        report = self.fm.hash_files([path, os.path.join(self.root, 'missing.txt')])
+        self.assertEqual(report[0].result, hashlib.sha256(b'test2').hexdigest())
+        self.assertIsInstance(report[1].error, FileNotFoundError)
+
+    def test_hash_cache_file(self):
+        path = self._write_file('file1.txt', 'test1')
+        cache_path = os.path.join(self.root, 'hashes.json')
+        digest = self.fm.hash_file(path=path)
+        self.fm.save_hash_cache(cache_path)
+        fm = FileManager(self.root)
+        self.assertEqual(fm.load_hash_cache(cache_path), 1)
+        with mock.patch('hashlib.new') as new:
+            self.assertEqual(fm.hash_file(path=path), digest)
+            new.assert_not_called()
+
+    def test_find_duplicates(self):
+        paths = [self._write_file(name, content) for name, content in (
+            ('file1.txt', 'same'), (os.path.join('folder1', 'file2.txt'), 'same'),
+            ('file3.txt', 'diff'), ('file4.txt', 'unique content'))]
+        self.assertEqual(self.fm.find_duplicates(workers=2), [sorted(paths[:2])])
+
+    def test_find_duplicates_errors(self):
+        paths = [self._write_file(f'file{i}.txt', 'same') for i in range(3)]
+        hash_file = FileManager._hash_file
+
+        def delete_file0(fm, path, algorithm):
+            if path == paths[0]:
+                os.remove(path)
+            return hash_file(fm, path, algorithm)
+
+        errors = []
+        with mock.patch.object(FileManager, '_hash_file', delete_file0):
+            groups = self.fm.find_duplicates(workers=2, onerror=errors.append)
+        self.assertEqual(groups, [paths[1:]])
+        self.assertIsInstance(errors[0], FileNotFoundError)
+
+
+class TestLineIndex(TempDirTestCase):
+
+    def test_read_line(self):
+        path = self._write_file('file1.txt', ''.join(f'line{i}\n' for i in range(100)))
+        self.assertEqual(self.fm.read_line(path), 'line0\n')
+        self.assertEqual(self.fm.read_line(path, line_number=42), 'line42\n')
+        self.assertEqual(self.fm.read_line(path, line_number=100), '')
+        self.assertEqual(self.fm.read_line_range(98, 105, path), ['line98\n', 'line99\n'])
+        with self.assertRaises(ValueError):
+            self.fm.read_line(path, line_number=-1)
+
+        # the index is revalidated when the file changes
+        self.fm.append_content('last', path)
+        self.assertEqual(self.fm.read_line(path, line_number=100), 'last')
+
+    def test_build_line_index(self):
+        path = self._write_file('file1.txt', 'test1\ntest2\ntest3')
+        self.assertEqual(self.fm.build_line_index(path, persist=True), 3)
+        self.assertTrue(self.fm.is_file(path + '.lineidx'))
+        fm = FileManager(self.root)
+        with mock.patch.object(FileManager, '_scan_line_offsets') as scan:
+            self.assertEqual(fm.read_line(path, line_number=2), 'test3')
+            scan.assert_not_called()
+
+
+class TestTailMethods(TempDirTestCase):
+
+    def test_read_new_lines(self):
+        path = self._write_file('file1.log', 'line0\nline1\npart')
+        self.assertEqual(self.fm.read_new_lines(path), ['line0\n', 'line1\n'])
+        self.assertEqual(self.fm.read_new_lines(path), [])
+        self.fm.append_content('ial\nline3\n', path)
+        self.assertEqual(self.fm.read_new_lines(path), ['partial\n', 'line3\n'])
+
+        # truncation restarts from the beginning
+        self.fm.write_content('new0\n', path)
+        self.assertEqual(self.fm.read_new_lines(path), ['new0\n'])
+
+        # rotation (a new file at the same path) restarts from the beginning
+        self.fm.rename_file(path + '.1', path)
+        self._write_file('file1.log', 'rotated0\nrotated1\n')
+        self.assertEqual(self.fm.read_new_lines(path), ['rotated0\n', 'rotated1\n'])
+
+    @unittest.skipUnless(locale.getpreferredencoding(False).lower().replace('-', '') == 'utf8',
+                         'requires a UTF-8 locale')
+    def test_read_new_lines_chunks(self):
+        path = self._write_file('file1.log', 'line0\nline1 is longer than a chunk\nline2\n\xff\n', 'w')
+        with mock.patch('filemanager.CHUNK_SIZE', 8):
+            self.assertEqual(self.fm.read_new_lines(path),
+                             ['line0\n', 'line1 is longer than a chunk\n', 'line2\n', '\xff\n'])
+            with open(path, 'ab') as f:
+                f.write(b'line45\n\xff\nline7\n')
+            # undecodable content is not skipped: the lines before it are returned first
+            self.assertEqual(self.fm.read_new_lines(path), ['line45\n'])
+            with self.assertRaises(ValueError):
+                self.fm.read_new_lines(path)
+            with self.assertRaises(ValueError):
+                self.fm.read_new_lines(path)
+
+    def test_follow_lines(self):
+        path = self._write_file('file1.log', 'old\n')
+
+        def writer():
+            for i in range(3):
+                time.sleep(0.02)
+                self.fm.append_content(f'line{i}\n', path)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        lines = list(self.fm.follow_lines(interval=0.01, timeout=0.2, from_end=True, path=path))
+        thread.join()
+        self.assertEqual(lines, ['line0\n', 'line1\n', 'line2\n'])
+
+
+class TestDurableWrites(TempDirTestCase):
+
+    def test_atomic_and_durable_writes(self):
+        path = self._write_file('file1.txt', 'old')
+        os.chmod(path, 0o640)
+        self.fm.write_content('test1\n', path, atomic=True, durable=True)
+        self.fm.write_lines(['test2\n'], path, atomic=True)
+        self.assertEqual(self.fm.read_content(path), 'test2\n')
+        self.assertEqual(os.stat(path).st_mode & 0o777, 0o640)
+        self.fm.write_bytes(b'test3', path, durable=True)
+        self.assertEqual(self.fm.read_bytes(path), b'test3')
+        self.assertEqual(os.listdir(self.root), ['file1.txt'])
+
+    def test_durable_write_flushes_writing_handle(self):
+        path = os.path.join(self.root, 'file1.txt.gz')
+        self.fm.enable_compression()
+        with mock.patch('os.fsync', wraps=os.fsync) as fsync, \
+                mock.patch('os.open', wraps=os.open) as open_fd:
+            self.fm.write_content('test1\n', path, durable=True)
+        # the file is flushed through its own handle; only the directory is opened
+        self.assertEqual(fsync.call_count, 1 if os.name == 'nt' else 2)
+        self.assertEqual(open_fd.call_count, 0 if os.name == 'nt' else 1)
+        self.assertEqual(self.fm.read_content(path), 'test1\n')
+
+    def test_group_commit(self):
+        paths = [os.path.join(self.root, f'file{i}.txt') for i in range(5)]
+        with self.fm.group_commit(workers=2):
+            for path in paths:
+                self.fm.write_content('test', path, atomic=True, durable=True)
+            self.assertFalse(self.fm.path_exists(paths[0]))
+        self.assertEqual([self.fm.read_content(path) for path in paths], ['test'] * 5)
+        self.assertEqual(len(os.listdir(self.root)), 5)
+
+        with self.assertRaises(RuntimeError):
+            with self.fm.group_commit():
+                self.fm.write_content('discarded', paths[0], atomic=True, durable=True)
+                raise RuntimeError
+        self.assertEqual(self.fm.read_content(paths[0]), 'test')
+        self.assertEqual(len(os.listdir(self.root)), 5)
+
+        # writes from other threads are not deferred into the block
+        other_path = os.path.join(self.root, 'other.txt')
+        with self.assertRaises(RuntimeError):
+            with self.fm.group_commit():
+                thread = threading.Thread(target=self.fm.write_content, args=('other', other_path),
+                                          kwargs={'atomic': True, 'durable': True})
+                thread.start()
+                thread.join()
+                raise RuntimeError
+        self.assertEqual(self.fm.read_content(other_path), 'other')
+
+
+class TestWriteBehind(TempDirTestCase):
+
+    def tearDown(self):
+        self.fm.disable_write_behind()
+        super().tearDown()
+
+    def test_write_behind_coalescing(self):
+        path = os.path.join(self.root, 'file1.txt')
+        self.fm.enable_write_behind(flush_interval=None)
+        with mock.patch.object(self.fm, '_write_file', wraps=self.fm._write_file) as write_file:
+            for i in range(100):
+                self.fm.write_content(f'test{i}', path)
+            self.fm.append_content('\n', path)
+            self.assertFalse(os.path.exists(path))
+            self.assertEqual(self.fm.read_content(path), 'test99\n')
+            self.fm.flush()
+            self.assertEqual(write_file.call_count, 1)
+        with open(path) as f:
+            self.assertEqual(f.read(), 'test99\n')
+
+        # other operations write the pending content first
+        self.fm.write_content('test1', path)
+        self.assertEqual(self.fm.read_all_lines(path), ['test1'])
+        self.fm.write_content('test2', path)
+        self.fm.rename_file(os.path.join(self.root, 'file2.txt'), path)
+        self.assertEqual(self.fm.read_content(os.path.join(self.root, 'file2.txt')), 'test2')
+        self.fm.write_content('test3', path, durable=True)
+        self.fm.disable_write_behind()
+        self.assertEqual(self.fm.read_content(path), 'test3')
+
+    def test_write_behind_consistency(self):
+        path = self._write_file('file1.txt', 'a\nb\nc\n')
+        self.fm.enable_write_behind(flush_interval=None)
+        self.fm.write_content('x\ny\nz\n', path)
+        self.assertEqual(self.fm.read_line(path, 1), 'y\n')
+        self.fm.write_content('u\nv\n', path)
+        self.assertEqual(self.fm.read_line_range(0, 5, path), ['u\n', 'v\n'])
+        self.fm.write_content('w\n', path)
+        self.assertEqual([entry.size for entry in self.fm.walk_directory()], [2])
+
+        # truncating writes drop the pending content
+        self.fm.write_content('secret\n', path)
+        self.fm.clear_file_content(path)
+        self.assertEqual(self.fm.read_content(path), '')
+        self.fm.write_content('secret\n', path)
+        self.fm.create_file(path)
+        self.fm.flush()
+        self.assertEqual(os.path.getsize(path), 0)
+
+        # pending paths are absolute
+        os.mkdir(os.path.join(self.root, 'folder1'))
+        cwd = os.getcwd()
+        try:
+            os.chdir(self.root)
+            self.fm.write_content('rel', 'file2.txt')
+            os.chdir('folder1')
+            self.fm.flush()
+        finally:
+            os.chdir(cwd)
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'file2.txt')))
+        self.assertFalse(os.path.exists(os.path.join(self.root, 'folder1', 'file2.txt')))
+
+    def test_write_behind_flush_triggers(self):
+        path = os.path.join(self.root, 'file1.txt')
+        self.fm.enable_write_behind(flush_interval=None, max_pending_size=10)
+        self.fm.write_content('test1', path)
+        self.assertFalse(os.path.exists(path))
+        self.fm.write_content('test1test2', os.path.join(self.root, 'file2.txt'))
+        self.assertTrue(os.path.exists(path))
+
+        self.fm.enable_write_behind(flush_interval=0.01)
+        self.fm.write_content('test1\ntest3', path)
+        deadline = time.monotonic() + 5
+        while os.path.getsize(path) == 5 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        with open(path) as f:
+            self.assertEqual(f.read(), 'test1\ntest3')
+        with self.assertRaises(ValueError):
+            self.fm.enable_write_behind(flush_interval=0)
+
+
+class TestFileAppender(TempDirTestCase):
+
+    def test_file_appender(self):
+        paths = [os.path.join(self.root, f'file{i}.txt') for i in range(3)]
+        with self.fm.open_appender(max_handles=2, flush_size=10) as appender:
+            for i in range(4):
+                for path in paths:
+                    appender.append(f'event{i}\n', path)
+            # the least recently used handle was evicted, so at most two files are open
+            self.assertEqual(len(appender._handles), 2)
+            self.assertIn('event0', self.fm.read_content(paths[0]))
+            appender.flush()
+            self.assertEqual(self.fm.read_content(paths[2]).count('event'), 4)
+        self.assertTrue(appender.closed)
+        with self.assertRaises(ValueError):
+            appender.append('event4\n', paths[0])
+        self.assertEqual(self.fm.read_all_lines(paths[1])[-1], 'event3\n')
+
+    def test_file_appender_flush_interval(self):
+        path = os.path.join(self.root, 'file1.txt')
+        with self.fm.open_appender(flush_interval=0.01) as appender:
+            appender.append('event0\n', path)
+            time.sleep(0.1)
+            self.assertEqual(self.fm.read_content(path), 'event0\n')
+
+
+class TestCompression(TempDirTestCase):
+
+    def test_compressed_content_methods(self):
+        self.fm.enable_compression(level=6)
+        for extension, module in (('.gz', gzip), ('.bz2', bz2), ('.xz', lzma)):
+            path = os.path.join(self.root, 'file1.txt' + extension)
+            self.fm.write_content('test1\n', path)
+            self.fm.append_content('test2\n', path)
+            with module.open(path, 'rt') as f:
+                self.assertEqual(f.read(), 'test1\ntest2\n')
+            self.assertEqual(self.fm.read_content(path), 'test1\ntest2\n')
+            self.assertEqual(list(self.fm.iter_lines(path)), ['test1\n', 'test2\n'])
+            self.fm.write_bytes(b'\x00\x01', path, atomic=True)
+            self.assertEqual(self.fm.read_bytes(path), b'\x00\x01')
+
+        # line reads and searches go through the codec, tailing is rejected
+        path = os.path.join(self.root, 'file3.txt.gz')
+        self.fm.write_lines([f'l{i}\n' for i in range(5)], path)
+        self.assertEqual(self.fm.read_line(path, 1), 'l1\n')
+        self.assertEqual(self.fm.read_line_range(3, 10, path), ['l3\n', 'l4\n'])
+        self.assertEqual([match.line for match in self.fm.search_content('l1', extensions='.gz')], ['l1'])
+        with self.assertRaises(ValueError):
+            self.fm.read_new_lines(path)
+        with self.assertRaises(ValueError):
+            self.fm.build_line_index(path)
+
+        # compression is opt-in
+        self.fm.disable_compression()
+        self.fm.write_content('plain', os.path.join(self.root, 'file2.gz'))
+        self.assertEqual(self.fm.read_bytes(os.path.join(self.root, 'file2.gz')), b'plain')
+
+    def test_background_compression(self):
+        self.fm.enable_compression(background_threshold=1024)
+        path = os.path.join(self.root, 'file1.txt.gz')
+        content = ''.join(f'line{i}\n' for i in range(CHUNK_SIZE // 4))
+        self.fm.write_content(content, path)
+        self.fm.append_content(content, path)
+        self.assertEqual(self.fm.read_content(path), content * 2)
+        self.fm.write_lines(['test1\n'] * 1000, path)
+        self.assertEqual(self.fm.read_all_lines(path), ['test1\n'] * 1000)
+        self.assertLess(os.path.getsize(path), 1000)
+        with self.assertRaises(ValueError):
+            self.fm.enable_compression(level=10)
+
+
+class TestFileIndex(TempDirTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self._write_file('file1.csv', 'a' * 100)
+        self._write_file(os.path.join('folder1', 'report_1.csv'), 'a' * 10)
+        self._write_file(os.path.join('folder1', 'report_2.txt'), 'a' * 1000)
+        self.index = self.fm.enable_index()
+
+    def tearDown(self):
+        self.fm.disable_index()
+        super().tearDown()
+
+    def _relative(self, paths):
+        return [os.path.relpath(path, self.root) for path in paths]
+
+    def test_index_query(self):
+        self.assertEqual(self._relative(self.index.query(extension='.csv', min_size=50)), ['file1.csv'])
+        self.assertEqual(self._relative(self.index.query(pattern='report_*', max_size=500)),
+                         [os.path.join('folder1', 'report_1.csv')])
+        self.assertEqual(self._relative(self.index.query(type='directory')), ['folder1'])
+        self.assertEqual(self.index.query(modified_before=0), [])
+
+    def test_index_refresh(self):
+        self._write_file(os.path.join('folder1', 'folder2', 'file2.csv'), 'b')
+        os.remove(os.path.join(self.root, 'file1.csv'))
+        self.assertEqual(self.index.refresh(), 4)
+        self.assertEqual(self._relative(self.index.query(extension='.csv')),
+                         [os.path.join('folder1', 'folder2', 'file2.csv'), os.path.join('folder1', 'report_1.csv')])
+        self.assertEqual(self.index.refresh(), 0)
+
+        # files modified in place in unchanged directories are re-stat'ed
+        with open(os.path.join(self.root, 'folder1', 'report_1.csv'), 'a') as f:
+            f.write('a' * 500)
+        self.assertEqual(self.index.refresh(), 1)
+        self.assertEqual(self._relative(self.index.query(extension='.csv', min_size=100)),
+                         [os.path.join('folder1', 'report_1.csv')])
+        self.assertEqual(self.index.refresh(full=True), 0)
+
+    def test_index_refresh_nested(self):
+        self._write_file(os.path.join('folder1', 'folder2', 'folder3', 'file2.txt'), 'b')
+        self.assertEqual(self.index.refresh(), 4)
+
+        # files added below unchanged directories are discovered
+        self._write_file(os.path.join('folder1', 'folder2', 'folder3', 'file3.csv'), 'c')
+        self.assertEqual(self.index.refresh(), 2)
+        self.assertIn(os.path.join('folder1', 'folder2', 'folder3', 'file3.csv'),
+                      self._relative(self.index.query(extension='.csv')))
+        self.assertEqual(self.index.refresh(full=True), 0)
+
+    def test_index_sync(self):
+        self.fm.create_file(os.path.join(self.root, 'file2.csv'))
+        self.fm.delete_file(os.path.join(self.root, 'file1.csv'))
+        self.fm.rename_directory(os.path.join(self.root, 'folder2'), os.path.join(self.root, 'folder1'))
+        self.fm.copy_directory(os.path.join(self.root, 'folder3'), path=os.path.join(self.root, 'folder2'))
+        self.assertEqual(self._relative(self.index.query(extension='.csv')), [
+            'file2.csv', os.path.join('folder2', 'report_1.csv'), os.path.join('folder3', 'report_1.csv')])
+        self.fm.delete_directory(os.path.join(self.root, 'folder3'), recursive=True)
+        self.assertEqual(self._relative(self.index.query(type=None)), [
+            'file2.csv', 'folder2', os.path.join('folder2', 'report_1.csv'), os.path.join('folder2', 'report_2.txt')])
+
+    def test_index_database_file(self):
+        with tempfile.TemporaryDirectory() as database_dir:
+            database_path = os.path.join(database_dir, 'index.sqlite')
+            self.fm.enable_index(database_path)
+            self.fm.disable_index()
+            index = self.fm.enable_index(database_path)
+            self.assertEqual(index.refresh(), 0)
+            self.assertEqual(len(index.query()), 3)
+            self.fm.disable_index()
+
+
+class TestMetrics(TempDirTestCase):
+
+    def test_metrics(self):
+        path = os.path.join(self.root, 'file1.txt')
+        self.fm.write_content('test1', path)
+        self.assertEqual(self.fm.get_metrics(), {})
+
+        calls = []
+        self.fm.enable_metrics()
+        self.fm.add_metrics_hook(lambda *args: calls.append(args))
+        self.fm.add_metrics_hook(lambda *args: 1 / 0)
+        self.fm.write_content('test1\ntest2\n', path)
+        self.fm.read_content(path)
+        self.assertEqual(list(self.fm.iter_lines(path)), ['test1\n', 'test2\n'])
+        self.fm.copy_file(os.path.join(self.root, 'file2.txt'), path=path)
+        with self.assertRaises(FileNotFoundError):
+            self.fm.read_content(os.path.join(self.root, 'missing.txt'))
+
+        metrics = self.fm.get_metrics()
+        self.assertEqual(sorted(metrics), ['copy', 'lines', 'read', 'write'])
+        self.assertEqual((metrics['read']['count'], metrics['read']['errors'], metrics['read']['bytes']), (2, 1, 12))
+        self.assertEqual((metrics['write']['bytes'], metrics['lines']['bytes'], metrics['copy']['bytes']), (12, 12, 12))
+        self.assertEqual(sum(metrics['read']['histogram'].values()), 2)
+        self.assertEqual([call[0] for call in calls], ['write', 'read', 'lines', 'copy', 'read'])
+        self.assertIsInstance(calls[-1][4], FileNotFoundError)
+
+        metrics_path = os.path.join(self.root, 'metrics.json')
+        self.fm.export_metrics(metrics_path)
+        with open(metrics_path) as f:
+            self.assertEqual(json.load(f)['read']['count'], 2)
+        self.fm.disable_metrics()
+        self.assertEqual(self.fm.get_metrics(), {})
+        with self.assertRaises(ValueError):
+            self.fm.add_metrics_hook(None)
+
+
+class TestAsyncFileManager(TempDirTestCase):
+
+    def test_async_file_manager(self):
+        path = os.path.join(self.root, 'file1.txt')
+
+        async def run():
+            async with AsyncFileManager(self.root, workers=2) as afm:
+                await afm.write_content('test1\ntest2\n', path)
+                content = await afm.read_content(path)
+                lines = [line async for line in afm.iter_lines(path)]
+                names = [name async for name in afm.list_directory_contents()]
+                with self.assertRaises(FileNotFoundError):
+                    await afm.read_content(os.path.join(self.root, 'missing.txt'))
+                with self.assertRaises(ValueError):
+                    await afm.write_content(123, path)
+                return content, lines, names
+
+        loop = asyncio.new_event_loop()
+        try:
+            content, lines, names = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual(content, 'test1\ntest2\n')
+        self.assertEqual(lines, ['test1\n', 'test2\n'])
+        self.assertEqual(names, ['file1.txt'])
+
+    def test_async_file_manager_batches(self):
+        path = self._write_file('file1.txt', ''.join(f'line{i}\n' for i in range(5000)))
+
+        async def run():
+            async with AsyncFileManager(self.root, workers=2) as afm:
+                with mock.patch('filemanager._AsyncCall._next_batch', autospec=True,
+                                side_effect=_AsyncCall._next_batch) as next_batch:
+                    lines = [line async for line in afm.iter_lines(path)]
+                with self.assertRaises(AttributeError):
+                    afm.group_commit()
+                with self.assertRaises(AttributeError):
+                    afm.index
+                return lines, next_batch.call_count
+
+        loop = asyncio.new_event_loop()
+        try:
+            lines, hops = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        self.assertEqual(len(lines), 5000)
+        self.assertEqual(lines[-1], 'line4999\n')
+        self.assertLessEqual(hops, 5000 // ASYNC_BATCH_SIZE + 2)
+
+
 if __name__ == '__main__':
     unittest.main(failfast=True)